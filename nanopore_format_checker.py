@@ -17,22 +17,43 @@ Install:
 """
 
 import argparse
+import csv
 import os
-import re
 import sys
+from collections import Counter, defaultdict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from importlib.util import find_spec
+from itertools import islice
 from pathlib import Path
+from typing import TextIO
 
-try:
-    import h5py
-    HAS_H5PY = True
-except ImportError:
-    HAS_H5PY = False
+# The optional readers are only located here, not imported: h5py and pod5
+# (which pulls in pyarrow) are imported on first use via _h5py()/_pod5(),
+# so --quick scans and runs without fast5/pod5 data never pay for them.
+HAS_H5PY = find_spec("h5py") is not None
+HAS_POD5 = find_spec("pod5") is not None
 
-try:
-    import pod5
-    HAS_POD5 = True
-except ImportError:
-    HAS_POD5 = False
+
+@cache
+def _h5py():
+    """Return the h5py module, importing it on first call; None if unavailable."""
+    try:
+        import h5py
+    except ImportError:
+        return None
+    return h5py
+
+
+@cache
+def _pod5():
+    """Return the pod5 module, importing it on first call; None if unavailable."""
+    try:
+        import pod5
+    except ImportError:
+        return None
+    return pod5
 
 FLOWCELL_PORE = {
     # R10.4.1
@@ -110,10 +131,91 @@ KIT_PORE = {
     "SQK-RNA004": "RNA004",
 }
 
+# Basecalled read file extensions counted inside fastq_* directories.
+FASTQ_EXTENSIONS = (".fastq", ".fastq.gz", ".fq", ".fq.gz")
+
+# Upper bound on files counted per pod5 / multi-read fast5 directory. The
+# count is informational only, so pathological trees stop early and are
+# reported as "N+" instead of walking every entry.
+MAX_COUNTED_FILES = 100_000
+
+# Compressed archive extensions treated as packed single-read fast5 runs.
+ARCHIVE_EXTENSIONS = (".tar", ".gz", ".tar.gz", ".tgz")
+
 
 def is_nanopore_run_dir(dirname: str) -> bool:
     """Check if directory name matches nanopore run naming convention (starts with date)."""
-    return bool(re.match(r"^\d{8}_", dirname))
+    # Equivalent to re.match(r"\d{8}_") without regex dispatch or a Match object
+    return len(dirname) > 8 and dirname[8] == "_" and dirname[:8].isdecimal()
+
+
+def _scan_subdirs(
+    root: str | os.PathLike,
+    max_depth: int,
+    classify: Callable[[str], str | None],
+    unreadable: set[str] | None = None,
+    on_root_entry: Callable[[os.DirEntry], None] | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Breadth-first os.scandir walk collecting directories that classify() labels.
+
+    classify(name) returns a category label for directories of interest and
+    None for everything else. Uses an explicit deque of (path, depth) pairs
+    instead of recursion and relies on DirEntry.is_dir(follow_symlinks=False),
+    which is answered from the d_type returned by readdir, so non-directories
+    are never stat()ed. Matched directories are not descended into. Paths are
+    plain strings throughout; callers wrap them in Path only where needed.
+
+    If an unreadable set is given, directories whose scandir raises
+    PermissionError (including root itself) are added to it, so callers
+    learn about permissions from the walk instead of probing. Matched
+    directories are not descended into, so their readability is recorded
+    with one open probe (_is_dir_readable) at the point they are matched.
+    If on_root_entry is given it is called with every entry (files included)
+    of root, letting callers gather root-level information from the same
+    directory read.
+
+    Directories reachable under more than one path (bind mounts, duplicated
+    mount points) are visited once: each matched or queued directory is
+    keyed by (st_dev, st_ino) and skipped if already seen. Directories at
+    max_depth that do not match are never stat()ed.
+
+    Returns (label, path) pairs in breadth-first order.
+    """
+    matches = []
+    seen = set()
+    queue = deque([(os.fspath(root), 1)])
+    while queue:
+        directory, depth = queue.popleft()
+        notify = on_root_entry if depth == 1 else None
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if notify is not None:
+                        notify(entry)
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    label = classify(entry.name)
+                    if label is None and depth >= max_depth:
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    key = (st.st_dev, st.st_ino)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if label is not None:
+                        matches.append((label, entry.path))
+                        if unreadable is not None and not _is_dir_readable(entry.path):
+                            unreadable.add(entry.path)
+                    else:
+                        queue.append((entry.path, depth + 1))
+        except PermissionError:
+            if unreadable is not None:
+                unreadable.add(directory)
+    return matches
 
 
 def find_named_subdirs(
@@ -129,33 +231,37 @@ def find_named_subdirs(
     This avoids enumerating large numbers of files (100k+ in single-read
     fast5 directories) that glob-based approaches would touch.
     """
-    matches = []
-
-    def _walk(directory: str, depth: int) -> None:
-        if depth > max_depth:
-            return
-        try:
-            with os.scandir(directory) as it:
-                for entry in it:
-                    if not entry.is_dir(follow_symlinks=False):
-                        continue
-                    matched = False
-                    if name is not None and entry.name == name:
-                        matches.append(Path(entry.path))
-                        matched = True
-                    elif prefix is not None and entry.name.startswith(prefix):
-                        matches.append(Path(entry.path))
-                        matched = True
-                    if not matched:
-                        _walk(entry.path, depth + 1)
-        except PermissionError:
-            pass
+    def _classify(dirname: str) -> str | None:
+        if name is not None and dirname == name:
+            return "match"
+        if prefix is not None and dirname.startswith(prefix):
+            return "match"
+        return None
 
-    _walk(str(run_path), 1)
-    return matches
+    return [Path(path) for _, path in _scan_subdirs(run_path, max_depth, _classify)]
+
+
+def _run_dir_category(name: str) -> str | None:
+    """Map a directory name to its discover_run_structure() category, or None."""
+    if name == "pod5":
+        return "pod5"
+    if name.startswith("pod5_"):
+        return "pod5_prefix"
+    if name == "fast5":
+        return "fast5"
+    if name.startswith("fast5_"):
+        return "fast5_prefix"
+    if name.startswith("fastq"):
+        return "fastq_prefix"
+    return None
 
 
-def discover_run_structure(run_path: Path, max_depth: int = 5) -> dict[str, list[Path]]:
+def discover_run_structure(
+    run_path: Path,
+    max_depth: int = 5,
+    on_root_entry: Callable[[os.DirEntry], None] | None = None,
+    variants: dict[str, set[str]] | None = None,
+) -> dict:
     """
     Walk the run directory tree once and categorize all format-related subdirectories.
 
@@ -165,6 +271,16 @@ def discover_run_structure(run_path: Path, max_depth: int = 5) -> dict[str, list
         "fast5"        - directories named exactly "fast5"
         "fast5_prefix" - directories starting with "fast5_" (fast5_pass, fast5_fail, etc.)
         "fastq_prefix" - directories starting with "fastq" (fastq_pass, fastq_fail, etc.)
+        "unreadable"   - set of directories (run_path, walked or matched) that
+                         cannot be listed
+
+    Each category value is a list of plain string paths, ready for
+    os.scandir and for the result dicts, so no Path objects are built per
+    match.
+
+    on_root_entry sees every entry of run_path (see _scan_subdirs). When
+    variants is given, the distinct folder names seen for each category are
+    added to variants[category] during the same loop.
     """
     result = {
         "pod5": [],
@@ -172,49 +288,26 @@ def discover_run_structure(run_path: Path, max_depth: int = 5) -> dict[str, list
         "fast5": [],
         "fast5_prefix": [],
         "fastq_prefix": [],
+        "unreadable": set(),
     }
-
-    def _walk(directory: str, depth: int) -> None:
-        if depth > max_depth:
-            return
-        try:
-            with os.scandir(directory) as it:
-                for entry in it:
-                    if not entry.is_dir(follow_symlinks=False):
-                        continue
-                    name = entry.name
-                    path = Path(entry.path)
-                    matched = False
-                    if name == "pod5":
-                        result["pod5"].append(path)
-                        matched = True
-                    elif name.startswith("pod5_"):
-                        result["pod5_prefix"].append(path)
-                        matched = True
-                    elif name == "fast5":
-                        result["fast5"].append(path)
-                        matched = True
-                    elif name.startswith("fast5_"):
-                        result["fast5_prefix"].append(path)
-                        matched = True
-                    elif name.startswith("fastq"):
-                        result["fastq_prefix"].append(path)
-                        matched = True
-
-                    if not matched:
-                        _walk(entry.path, depth + 1)
-        except PermissionError:
-            pass
-
-    _walk(str(run_path), 1)
+    for category, path in _scan_subdirs(run_path, max_depth, _run_dir_category,
+                                        result["unreadable"], on_root_entry):
+        result[category].append(path)
+        if variants is not None:
+            variants.setdefault(category, set()).add(os.path.basename(path))
     return result
 
 
 def _is_dir_readable(directory: Path) -> bool:
-    """Check if a directory is readable without enumerating its contents."""
+    """Check if a directory is readable by opening it, without enumerating its contents.
+
+    The directory is actually opened rather than checked with os.access(),
+    which tests the real uid (always True for root) and can misreport ACLs
+    and NFS root_squash.
+    """
     try:
-        with os.scandir(directory) as it:
-            next(it, None)
+        with os.scandir(directory):
+            pass
         return True
     except PermissionError:
         return False
@@ -239,6 +332,8 @@ def fast_count_files(
     ext: str | None = None,
     recursive: bool = False,
     extensions: tuple[str, ...] | None = None,
+    max_count: int | None = None,
+    max_depth: int = 4,
 ) -> tuple[int, int]:
     """
     Count files matching extension(s) using os.scandir for speed.
@@ -246,36 +341,47 @@ def fast_count_files(
     Accepts either a single ext (".fast5") or a tuple of extensions
     (".fastq", ".fastq.gz", ".fq", ".fq.gz") for single-pass counting.
 
+    When max_count is given, the walk stops as soon as that many matching
+    files have been seen; a returned count equal to max_count is therefore
+    a lower bound, as is the accompanying size.
+
+    Subdirectories are walked with an explicit stack of plain string paths
+    rather than recursion, so no Path objects are built per directory.
+    Recursion stops at max_depth levels (directory itself is level 1):
+    ONT layouts keep data files within a few levels of their pod5/fast5/
+    fastq folder, so deeper subtrees are not worth reading.
+
     Returns (file_count, total_size_bytes). The size is accumulated from
     stat info that is already cached by the OS after the is_file() check.
     """
     count = 0
     size = 0
-    try:
-        with os.scandir(directory) as it:
-            for entry in it:
-                if entry.is_file(follow_symlinks=False):
-                    matched = False
-                    if ext is not None and entry.name.endswith(ext):
-                        matched = True
-                    elif extensions is not None and any(
-                        entry.name.endswith(e) for e in extensions
-                    ):
-                        matched = True
-                    if matched:
-                        count += 1
-                        try:
-                            size += entry.stat(follow_symlinks=False).st_size
-                        except OSError:
-                            pass
-                elif recursive and entry.is_dir(follow_symlinks=False):
-                    sub_count, sub_size = fast_count_files(
-                        Path(entry.path), ext=ext, recursive=True, extensions=extensions
-                    )
-                    count += sub_count
-                    size += sub_size
-    except PermissionError:
-        pass
+    stack = [(os.fspath(directory), 1)]
+    push = stack.append
+    while stack:
+        path, depth = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        name = entry.name
+                        matched = False
+                        if ext is not None and name.endswith(ext):
+                            matched = True
+                        elif extensions is not None and name.endswith(extensions):
+                            matched = True
+                        if matched:
+                            count += 1
+                            try:
+                                size += entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                pass
+                            if max_count is not None and count >= max_count:
+                                return count, size
+                    elif recursive and depth < max_depth and entry.is_dir(follow_symlinks=False):
+                        push((entry.path, depth + 1))
+        except PermissionError:
+            pass
     return count, size
 
 
@@ -291,32 +397,31 @@ def estimate_dir_size(
     Iterates all directory entries (cheap readdir) but limits stat() calls
     to sample_size files. Remaining file sizes are extrapolated from the
     sampled average. For directories with fewer matching files than
-    sample_size, the returned size is exact.
+    sample_size, the returned size is exact. Subdirectories are walked with
+    an explicit stack, as in fast_count_files().
 
     Returns (file_count, estimated_size_bytes, is_estimated).
     """
     count = 0
     sampled_sizes = []
-
-    def _scan(path: str) -> None:
-        nonlocal count
+    stack = [os.fspath(directory)]
+    while stack:
         try:
-            with os.scandir(path) as it:
+            with os.scandir(stack.pop()) as it:
                 for entry in it:
-                    if entry.is_file(follow_symlinks=False) and entry.name.endswith(ext):
-                        count += 1
-                        if len(sampled_sizes) < sample_size:
-                            try:
-                                sampled_sizes.append(entry.stat(follow_symlinks=False).st_size)
-                            except OSError:
-                                pass
+                    if entry.is_file(follow_symlinks=False):
+                        if entry.name.endswith(ext):
+                            count += 1
+                            if len(sampled_sizes) < sample_size:
+                                try:
+                                    sampled_sizes.append(entry.stat(follow_symlinks=False).st_size)
+                                except OSError:
+                                    pass
                     elif recursive and entry.is_dir(follow_symlinks=False):
-                        _scan(entry.path)
+                        stack.append(entry.path)
         except PermissionError:
             pass
 
-    _scan(str(directory))
-
     if not sampled_sizes:
         return count, 0, False
     if count <= len(sampled_sizes):
@@ -338,23 +443,42 @@ def classify_fast5_by_size(fast5_file: Path) -> str:
     This is much faster than opening the HDF5 file, especially for large directories.
     """
     try:
-        size_bytes = fast5_file.stat().st_size
-        # Threshold: files under 1 MB are likely single-read
-        if size_bytes < 1_000_000:  # 1 MB
-            return "single_read_fast5"
-        else:
-            return "multi_read_fast5"
-    except (OSError, PermissionError):
+        return classify_fast5_from_size(fast5_file.stat().st_size)
+    except OSError:
         return "fast5_unknown"
 
 
-def classify_fast5(fast5_file: Path) -> str:
+def classify_fast5_from_size(size_bytes: int) -> str:
+    """
+    Classify a fast5 file from an already-known size in bytes.
+
+    Lets scandir-based callers reuse the DirEntry stat result instead of
+    stat-ing the file a second time.
+    """
+    # Threshold: files under 1 MB are likely single-read
+    if size_bytes < 1_000_000:  # 1 MB
+        return "single_read_fast5"
+    return "multi_read_fast5"
+
+
+def classify_fast5(fast5_file: Path | os.DirEntry | int) -> str:
     """
     Determine if a fast5 file is single-read or multi-read.
 
     Uses file size heuristic for speed - single-read files are typically <1MB,
     multi-read files are typically >1MB.
+
+    Accepts a precomputed size in bytes, a DirEntry (sized from its cached
+    scandir stat, so callers at a scandir site pay at most one stat), or a
+    path, which is stat()ed.
     """
+    if isinstance(fast5_file, int):
+        return classify_fast5_from_size(fast5_file)
+    if isinstance(fast5_file, os.DirEntry):
+        try:
+            return classify_fast5_from_size(fast5_file.stat(follow_symlinks=False).st_size)
+        except OSError:
+            return "fast5_unknown"
     return classify_fast5_by_size(fast5_file)
 
 
@@ -365,6 +489,16 @@ def _decode_attr(val):
     return str(val)
 
 
+def _decode_code(val) -> str:
+    """Decode a flowcell/kit product code, uppercased for table lookup.
+
+    ONT writes these codes in upper case already, so the copy made by
+    upper() is skipped when the string is already upper case.
+    """
+    s = _decode_attr(val)
+    return s if s.isupper() else s.upper()
+
+
 def extract_chemistry_fast5(file_path: Path) -> dict | None:
     """Extract flowcell chemistry metadata from a fast5 file.
 
@@ -376,27 +510,33 @@ def extract_chemistry_fast5(file_path: Path) -> dict | None:
     Returns {"flowcell": "FLO-MIN114", "kit": "SQK-LSK114",
     "sample_rate": 5000} or None on failure.
     """
-    if not HAS_H5PY:
+    h5py = _h5py()
+    if h5py is None:
         return None
     try:
         with h5py.File(file_path, "r") as f:
             ctx = None
             trk = None
 
-            if "UniqueGlobalKey" in f:
-                if "context_tags" in f["UniqueGlobalKey"]:
-                    ctx = f["UniqueGlobalKey/context_tags"]
-                if "tracking_id" in f["UniqueGlobalKey"]:
-                    trk = f["UniqueGlobalKey/tracking_id"]
+            # Group.get() resolves each link once, instead of a membership
+            # test followed by a second lookup of the same path.
+            ugk = f.get("UniqueGlobalKey")
+            if ugk is not None:
+                ctx = ugk.get("context_tags")
+                trk = ugk.get("tracking_id")
             else:
-                # Multi-read layout: check first few reads for metadata groups
-                for key in list(f.keys())[:5]:
+                # Multi-read layout: check first few reads for metadata groups.
+                # islice avoids materialising every read_id in the file.
+                # Stray datasets and unreadable groups are skipped.
+                for key in islice(f, 5):
                     try:
                         grp = f[key]
-                        if ctx is None and "context_tags" in grp:
-                            ctx = grp["context_tags"]
-                        if trk is None and "tracking_id" in grp:
-                            trk = grp["tracking_id"]
+                        if not isinstance(grp, h5py.Group):
+                            continue
+                        if ctx is None:
+                            ctx = grp.get("context_tags")
+                        if trk is None:
+                            trk = grp.get("tracking_id")
                     except Exception:
                         continue
                     if ctx is not None and trk is not None:
@@ -408,17 +548,17 @@ def extract_chemistry_fast5(file_path: Path) -> dict | None:
             sample_rate = 0
 
             if ctx is not None:
-                flowcell = _decode_attr(ctx.attrs.get("flowcell_type", "")).upper()
-                kit = _decode_attr(ctx.attrs.get("sequencing_kit", "")).upper()
+                flowcell = _decode_code(ctx.attrs.get("flowcell_type", ""))
+                kit = _decode_code(ctx.attrs.get("sequencing_kit", ""))
                 # Older MinKNOW versions used experiment_kit instead of sequencing_kit
                 if not kit:
-                    kit = _decode_attr(ctx.attrs.get("experiment_kit", "")).upper()
+                    kit = _decode_code(ctx.attrs.get("experiment_kit", ""))
                 rate_str = _decode_attr(ctx.attrs.get("sample_frequency", "0"))
                 sample_rate = int(rate_str) if rate_str.isdigit() else 0
 
             # Fallback to tracking_id for flowcell product code
             if not flowcell and trk is not None:
-                flowcell = _decode_attr(trk.attrs.get("flow_cell_product_code", "")).upper()
+                flowcell = _decode_code(trk.attrs.get("flow_cell_product_code", ""))
             # Also try tracking_id for sample_frequency if not found
             if sample_rate == 0 and trk is not None:
                 rate_str = _decode_attr(trk.attrs.get("sample_frequency", "0"))
@@ -427,13 +567,15 @@ def extract_chemistry_fast5(file_path: Path) -> dict | None:
             # Last resort: get sampling_rate from channel_id group (older
             # multi-read fast5 files that lack context_tags/tracking_id
             # entirely).  channel_id/sampling_rate is a float (e.g. 4000.0).
+            # A read may carry a zero or missing rate, so the first few reads
+            # are tried until one gives a positive rate.
             if sample_rate == 0:
-                for key in list(f.keys())[:5]:
+                keys = ("UniqueGlobalKey",) if ugk is not None else islice(f, 5)
+                for key in keys:
                     try:
-                        grp = f[key]
-                        if "channel_id" in grp:
-                            raw_rate = grp["channel_id"].attrs.get("sampling_rate", 0)
-                            sample_rate = int(float(raw_rate))
+                        chan = f[key].get("channel_id")
+                        if chan is not None:
+                            sample_rate = max(int(float(chan.attrs.get("sampling_rate", 0))), 0)
                             if sample_rate > 0:
                                 break
                     except Exception:
@@ -456,45 +598,59 @@ def extract_chemistry_pod5(file_path: Path) -> dict | None:
     Returns {"flowcell": "FLO-MIN114", "kit": "SQK-LSK114",
     "sample_rate": 5000} or None.
     """
-    if not HAS_POD5:
-        return None
     try:
-        with pod5.Reader(file_path) as reader:
-            for read in reader.reads():
-                info = read.run_info
-                flowcell = (info.flow_cell_product_code or "").upper()
-                kit = (info.sequencing_kit or "").upper()
-                sample_rate = int(info.sample_rate or 0)
-
-                # Fallback: check context_tags dict (may hold fast5 metadata)
-                ctx = info.context_tags or {}
-                if not flowcell:
-                    flowcell = ctx.get("flowcell_type", "").upper()
-                if not kit:
-                    kit = ctx.get("sequencing_kit", "").upper()
-                if not kit:
-                    kit = ctx.get("experiment_kit", "").upper()
-                if sample_rate == 0:
-                    rate_str = ctx.get("sample_frequency", "0")
-                    sample_rate = int(rate_str) if rate_str.isdigit() else 0
-
-                # Fallback: check tracking_id dict
-                trk = info.tracking_id or {}
-                if not flowcell:
-                    flowcell = trk.get("flow_cell_product_code", "").upper()
-
-                if not flowcell and not kit and sample_rate == 0:
-                    return None
-                return {
-                    "flowcell": flowcell,
-                    "kit": kit,
-                    "sample_rate": sample_rate,
-                }
-        return None
+        return _read_pod5_chemistry(file_path)
     except Exception:
         return None
 
 
+def _read_pod5_chemistry(file_path: str | os.PathLike) -> dict | None:
+    """extract_chemistry_pod5() without the error handling.
+
+    Returns None when the pod5 library is missing or the file opens but
+    carries no chemistry metadata, and raises when the file cannot be
+    opened or read, so callers can tell a bad file from an empty one.
+    """
+    pod5 = _pod5()
+    if pod5 is None:
+        return None
+    with pod5.Reader(file_path) as reader:
+        # Only the first read's RunInfo is needed; next() stops the read
+        # generator after its first batch instead of looping over reads.
+        read = next(reader.reads(), None)
+        if read is None:
+            return None
+        info = read.run_info
+        flowcell = _decode_code(info.flow_cell_product_code or "")
+        kit = _decode_code(info.sequencing_kit or "")
+        sample_rate = int(info.sample_rate or 0)
+
+        # Fallback: check context_tags dict (may hold fast5 metadata)
+        ctx = info.context_tags or {}
+        if not flowcell:
+            flowcell = _decode_code(ctx.get("flowcell_type", ""))
+        if not kit:
+            kit = _decode_code(ctx.get("sequencing_kit", ""))
+        if not kit:
+            kit = _decode_code(ctx.get("experiment_kit", ""))
+        if sample_rate == 0:
+            rate_str = ctx.get("sample_frequency", "0")
+            sample_rate = int(rate_str) if rate_str.isdigit() else 0
+
+        # Fallback: check tracking_id dict
+        trk = info.tracking_id or {}
+        if not flowcell:
+            flowcell = _decode_code(trk.get("flow_cell_product_code", ""))
+
+        if not flowcell and not kit and sample_rate == 0:
+            return None
+        return {
+            "flowcell": flowcell,
+            "kit": kit,
+            "sample_rate": sample_rate,
+        }
+
+
 def extract_chemistry(file_path: Path, file_format: str) -> dict | None:
     """Extract flowcell chemistry from a data file.
 
@@ -516,11 +672,21 @@ def classify_chemistry(chemistry: dict) -> dict:
 
     Input: {"flowcell": "FLO-MIN114", "kit": "SQK-LSK114", "sample_rate": 5000}
     Output: {"pore", "analyte", "dorado_version", "model_hint", "note"}
+
+    Runs from the same sequencer share a handful of (flowcell, kit,
+    sample_rate) triples, so the mapping itself is memoised; each caller
+    gets its own copy of the result dict.
     """
-    flowcell = chemistry.get("flowcell", "")
-    kit = chemistry.get("kit", "")
-    sample_rate = chemistry.get("sample_rate", 0)
+    return dict(_classify_chemistry(
+        chemistry.get("flowcell", ""),
+        chemistry.get("kit", ""),
+        chemistry.get("sample_rate", 0),
+    ))
+
 
+@cache
+def _classify_chemistry(flowcell: str, kit: str, sample_rate: int) -> dict:
+    """Cached body of classify_chemistry(); the returned dict must not be mutated."""
     pore = FLOWCELL_PORE.get(flowcell, "unknown")
     # Fallback: infer pore type from kit when flowcell code is absent
     if pore == "unknown" and kit:
@@ -580,12 +746,44 @@ def classify_chemistry(chemistry: dict) -> dict:
     }
 
 
-def count_files_recursive(directory: Path, ext: str) -> tuple[int, int]:
+def count_files_recursive(
+    directory: Path, ext: str, max_count: int | None = None, max_depth: int = 4
+) -> tuple[int, int]:
     """Count files with given extension recursively using fast os.scandir.
 
-    Returns (file_count, total_size_bytes).
+    Returns (file_count, total_size_bytes). See fast_count_files() for the
+    meaning of max_count and max_depth.
     """
-    return fast_count_files(directory, ext, recursive=True)
+    return fast_count_files(directory, ext, recursive=True, max_count=max_count,
+                            max_depth=max_depth)
+
+
+def count_files_in_dirs(
+    directories: list[str],
+    ext: str | None = None,
+    extensions: tuple[str, ...] | None = None,
+    max_count: int | None = None,
+    max_depth: int = 4,
+) -> tuple[int, int, bool]:
+    """Recursively count matching files across several directories.
+
+    Each directory is walked once by fast_count_files(); max_count applies
+    per directory, as it did when callers counted each one separately.
+
+    Returns (file_count, total_size_bytes, capped) where capped is True if
+    any directory reached max_count, so the totals are lower bounds.
+    """
+    total = 0
+    total_size = 0
+    capped = False
+    for d in directories:
+        count, size = fast_count_files(d, ext, recursive=True, extensions=extensions,
+                                       max_count=max_count, max_depth=max_depth)
+        total += count
+        total_size += size
+        if max_count is not None and count >= max_count:
+            capped = True
+    return total, total_size, capped
 
 
 def compute_dir_size(directory: Path) -> int:
@@ -611,47 +809,75 @@ def compute_dir_size(directory: Path) -> int:
     return total
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_size(size_bytes: int) -> str:
     """Format a byte count as a human-readable string (e.g. '1.2 GB')."""
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    for unit in ("KB", "MB", "GB", "TB"):
-        size_bytes /= 1024
-        if size_bytes < 1024 or unit == "TB":
-            return f"{size_bytes:.1f} {unit}"
-    return f"{size_bytes:.1f} TB"
+    # (bit_length - 1) // 10 is floor(log1024(size)), so the unit is picked
+    # directly instead of by repeated division.
+    exp = min((int(size_bytes).bit_length() - 1) // 10, 4)
+    return f"{size_bytes / (1 << (10 * exp)):.1f} {_SIZE_UNITS[exp]}"
 
 
-def _find_first_pod5(directory: Path) -> Path | None:
-    """Find the first .pod5 file in a directory, descending into one level of subdirs.
+@cache
+def _chemistry_label(pore: str, sample_rate: int) -> str:
+    """Short chemistry label for the summary table (e.g. 'R10.4.1 5kHz').
+
+    Cached because a run list usually repeats a few pore/rate pairs.
+    """
+    if pore == "unknown":
+        return "-"
+    return f"{pore} {sample_rate // 1000}kHz" if sample_rate else pore
+
+
+def _iter_pod5_samples(directory: str | os.PathLike, max_files: int = 3):
+    """Yield up to max_files .pod5 file paths from a directory, descending into one level of subdirs.
 
     Barcoded runs store pod5 files inside barcode subdirectories
     (pod5_pass/barcode01/*.pod5), so a flat scan of the pod5 directory
-    may yield only subdirectories. This helper checks the top level first,
-    then peeks into immediate subdirectories.
+    may yield only subdirectories. This helper yields top-level files
+    first, then peeks into immediate subdirectories. Being a generator, it
+    stops reading as soon as the caller has what it needs, and a caller can
+    move on to the next candidate (e.g. after a corrupt file) without the
+    directory being scanned again.
     """
+    remaining = max_files
+    subdirs = []
     try:
         with os.scandir(directory) as it:
-            subdirs = []
             for entry in it:
                 if entry.is_file(follow_symlinks=False) and entry.name.endswith(".pod5"):
-                    return Path(entry.path)
-                if entry.is_dir(follow_symlinks=False):
+                    yield entry.path
+                    remaining -= 1
+                    if remaining <= 0:
+                        return
+                elif entry.is_dir(follow_symlinks=False):
                     subdirs.append(entry.path)
-        for subdir in subdirs:
-            try:
-                with os.scandir(subdir) as it:
-                    for entry in it:
-                        if entry.is_file(follow_symlinks=False) and entry.name.endswith(".pod5"):
-                            return Path(entry.path)
-            except PermissionError:
-                pass
     except PermissionError:
-        pass
-    return None
+        return
+    for subdir in subdirs:
+        try:
+            with os.scandir(subdir) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False) and entry.name.endswith(".pod5"):
+                        yield entry.path
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+        except PermissionError:
+            pass
 
 
-def analyze_run(run_path: Path, quick: bool = False) -> dict:
+def _find_first_pod5(directory: Path) -> Path | None:
+    """Find the first .pod5 file in a directory (see _iter_pod5_samples)."""
+    first = next(_iter_pod5_samples(directory, max_files=1), None)
+    return Path(first) if first is not None else None
+
+
+def analyze_run(run_path: str | os.PathLike, quick: bool = False) -> dict:
     """
     Analyze a nanopore run directory and determine its read format(s).
 
@@ -668,42 +894,45 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
         - formats: list of detected formats
         - details: dict with per-format info (paths, file counts)
     """
-    result = {"formats": [], "details": {}, "chemistry": None, "chemistry_classification": None, "run_path": str(run_path)}
+    # All paths in the result are plain strings; run_path may be a Path or str
+    run_path = os.fspath(run_path)
+    result = {"formats": [], "details": {}, "chemistry": None, "chemistry_classification": None, "run_path": run_path}
+    if not quick:
+        # Running total of every data_size_bytes set below
+        result["total_size_bytes"] = 0
 
-    # --- Check permissions on run directory and its subdirectories ---
-    # Use os.scandir to extract only subdirectories, skipping all files.
-    # This avoids materializing 100k+ Path objects in single-read fast5 dirs.
-    permission_errors = []
-    subdirs = []
-    try:
-        with os.scandir(run_path) as it:
-            for entry in it:
-                if entry.is_dir(follow_symlinks=False):
-                    subdirs.append(Path(entry.path))
-    except PermissionError:
+    # --- Single-pass directory discovery ---
+    # Permission problems are picked up by the walk itself rather than by
+    # probing every subdirectory up front. The same read of run_path also
+    # records the root-level files and numeric subdirs used by the
+    # single-read fast5 and archive checks below.
+    root_fast5 = None       # (path, classification) of the first .fast5 in run_path
+    first_numeric_dir = None
+    archive_names = []
+
+    def _note_root_entry(entry: os.DirEntry) -> None:
+        nonlocal root_fast5, first_numeric_dir
+        name = entry.name
+        if entry.is_file(follow_symlinks=False):
+            if name.endswith(".fast5"):
+                if root_fast5 is None:
+                    root_fast5 = (entry.path, classify_fast5(entry))
+            elif name.endswith(ARCHIVE_EXTENSIONS):
+                archive_names.append(name)
+        elif first_numeric_dir is None and name.isdecimal() and entry.is_dir(follow_symlinks=False):
+            first_numeric_dir = entry.path
+
+    variants = defaultdict(set)
+    structure = discover_run_structure(run_path, on_root_entry=_note_root_entry,
+                                       variants=variants)
+    unreadable = structure["unreadable"]
+    if run_path in unreadable:
         result["formats"].append("permission_denied")
         result["details"]["permission_denied"] = {
             "reasons": [f"Cannot read run directory: {run_path}"],
         }
         return result
 
-    for sd in subdirs:
-        if not _is_dir_readable(sd):
-            permission_errors.append(sd.name)
-
-    if permission_errors and not any(
-        sd.name not in permission_errors for sd in subdirs
-    ):
-        # ALL subdirectories are unreadable
-        result["formats"].append("permission_denied")
-        result["details"]["permission_denied"] = {
-            "reasons": [f"All subdirectories are unreadable ({len(permission_errors)} dir(s))"],
-            "inaccessible_dirs": permission_errors,
-        }
-        return result
-
-    # --- Single-pass directory discovery ---
-    structure = discover_run_structure(run_path)
     pod5_dirs = structure["pod5"]
     pod5_variant_dirs = structure["pod5_prefix"]
     fast5_dirs = structure["fast5"]
@@ -713,18 +942,20 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
     # --- Check for pod5 (pod5/ or pod5_pass/pod5_fail/pod5_skip, up to 5 levels down) ---
     all_pod5_dirs = pod5_dirs + pod5_variant_dirs
     if all_pod5_dirs:
-        variant_names = sorted(set(d.name for d in all_pod5_dirs))
-        unreadable_pod5 = [str(d) for d in all_pod5_dirs if not _is_dir_readable(d)]
+        variant_names = sorted(variants["pod5"] | variants["pod5_prefix"])
+        unreadable_pod5 = [d for d in all_pod5_dirs if d in unreadable]
         pod5_detail = {
-            "directories": [str(d) for d in all_pod5_dirs],
+            "directories": all_pod5_dirs,
             "folder_variants": variant_names,
         }
         if not quick:
-            counts = [count_files_recursive(d, ".pod5") for d in all_pod5_dirs]
-            total_pod5 = sum(c for c, _ in counts)
-            total_pod5_size = sum(s for _, s in counts)
+            total_pod5, total_pod5_size, capped = count_files_in_dirs(
+                all_pod5_dirs, ".pod5", max_count=MAX_COUNTED_FILES, max_depth=3)
             pod5_detail["file_count"] = total_pod5
             pod5_detail["data_size_bytes"] = total_pod5_size
+            result["total_size_bytes"] += total_pod5_size
+            if capped:
+                pod5_detail["file_count_capped"] = True
         if unreadable_pod5:
             pod5_detail["note"] = f"Permission denied on {len(unreadable_pod5)} pod5 dir(s)"
             pod5_detail["inaccessible_dirs"] = unreadable_pod5
@@ -733,36 +964,45 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
         result["formats"].append("pod5")
         result["details"]["pod5"] = pod5_detail
 
-        # Extract chemistry from first pod5 file
+        # Extract chemistry from one pod5 file per directory. The next
+        # candidate in the same directory is only tried when a file fails to
+        # open or read (truncated, still being written); a file that opens
+        # but has no metadata moves on to the next directory, as before
         if result["chemistry"] is None:
             for d in all_pod5_dirs:
-                if str(d) in unreadable_pod5:
+                if d in unreadable_pod5:
                     continue
-                pod5_file = _find_first_pod5(d)
-                if pod5_file:
-                    chem = extract_chemistry(pod5_file, "pod5")
-                    if chem:
-                        result["chemistry"] = chem
-                        result["chemistry_classification"] = classify_chemistry(chem)
-                        break
+                chem = None
+                for pod5_file in _iter_pod5_samples(d):
+                    try:
+                        chem = _read_pod5_chemistry(pod5_file)
+                    except Exception:
+                        continue
+                    break
+                if chem:
+                    result["chemistry"] = chem
+                    result["chemistry_classification"] = classify_chemistry(chem)
+                    break
 
     # --- Check for fast5 (fast5/ or fast5_skip/fast5_pass/fast5_fail, up to 5 levels down) ---
     all_fast5_dirs = fast5_dirs + fast5_variant_dirs
     if all_fast5_dirs:
-        unreadable_fast5 = [str(d) for d in all_fast5_dirs if not _is_dir_readable(d)]
+        unreadable_fast5 = [d for d in all_fast5_dirs if d in unreadable]
 
         # Sample a fast5 file using os.scandir — also peek into subdirs (numeric 0/1/..., barcode01/, etc.)
         sample_file = None
+        classification = None
         has_subdirs = False
         for d in all_fast5_dirs:
-            if str(d) in unreadable_fast5:
+            if d in unreadable_fast5:
                 continue
             try:
                 subdirs = []
                 with os.scandir(d) as it:
                     for entry in it:
                         if entry.is_file(follow_symlinks=False) and entry.name.endswith(".fast5"):
-                            sample_file = Path(entry.path)
+                            classification = classify_fast5(entry)
+                            sample_file = entry.path
                             break
                         elif entry.is_dir(follow_symlinks=False):
                             has_subdirs = True
@@ -773,7 +1013,8 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
                             with os.scandir(subdir) as sub_it:
                                 for sub_entry in sub_it:
                                     if sub_entry.is_file(follow_symlinks=False) and sub_entry.name.endswith(".fast5"):
-                                        sample_file = Path(sub_entry.path)
+                                        classification = classify_fast5(sub_entry)
+                                        sample_file = sub_entry.path
                                         break
                         except PermissionError:
                             pass
@@ -784,17 +1025,16 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
             if sample_file is not None:
                 break
 
-        variant_names = sorted(set(d.name for d in all_fast5_dirs))
+        variant_names = sorted(variants["fast5"] | variants["fast5_prefix"])
         fast5_info = {
-            "directories": [str(d) for d in all_fast5_dirs],
+            "directories": all_fast5_dirs,
             "folder_variants": variant_names,
         }
         if unreadable_fast5:
             fast5_info["inaccessible_dirs"] = unreadable_fast5
 
         if sample_file:
-            classification = classify_fast5(sample_file)
-            fast5_info["sampled_file"] = sample_file.name
+            fast5_info["sampled_file"] = os.path.basename(sample_file)
 
             if classification == "single_read_fast5":
                 if not quick:
@@ -804,6 +1044,7 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
                     is_estimated = any(e for _, _, e in counts)
                     fast5_info["file_count"] = total_count
                     fast5_info["data_size_bytes"] = total_size
+                    result["total_size_bytes"] += total_size
                     if is_estimated:
                         fast5_info["size_estimated"] = True
                 if has_subdirs:
@@ -815,11 +1056,13 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
             elif classification == "multi_read_fast5":
                 # Multi-read -- count is fast (few large files)
                 if not quick:
-                    counts = [count_files_recursive(d, ".fast5") for d in all_fast5_dirs]
-                    total_fast5 = sum(c for c, _ in counts)
-                    total_fast5_size = sum(s for _, s in counts)
+                    total_fast5, total_fast5_size, capped = count_files_in_dirs(
+                        all_fast5_dirs, ".fast5", max_count=MAX_COUNTED_FILES)
                     fast5_info["file_count"] = total_fast5
                     fast5_info["data_size_bytes"] = total_fast5_size
+                    result["total_size_bytes"] += total_fast5_size
+                    if capped:
+                        fast5_info["file_count_capped"] = True
                 result["formats"].append("multi_read_fast5")
                 result["details"]["multi_read_fast5"] = fast5_info
             else:
@@ -846,19 +1089,18 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
 
     # --- Check for fastq (fastq_pass/fastq_fail, up to 5 levels down) ---
     if fastq_dirs:
-        unreadable_fastq = [str(d) for d in fastq_dirs if not _is_dir_readable(d)]
-        variant_names = sorted(set(d.name for d in fastq_dirs))
+        unreadable_fastq = [d for d in fastq_dirs if d in unreadable]
+        variant_names = sorted(variants["fastq_prefix"])
         fastq_detail = {
-            "directories": [str(d) for d in fastq_dirs],
+            "directories": fastq_dirs,
             "folder_variants": variant_names,
         }
         if not quick:
-            _fastq_exts = (".fastq", ".fastq.gz", ".fq", ".fq.gz")
-            counts = [fast_count_files(d, extensions=_fastq_exts, recursive=True) for d in fastq_dirs]
-            total_fastq = sum(c for c, _ in counts)
-            total_fastq_size = sum(s for _, s in counts)
+            total_fastq, total_fastq_size, _ = count_files_in_dirs(
+                fastq_dirs, extensions=FASTQ_EXTENSIONS, max_depth=3)
             fastq_detail["file_count"] = total_fastq
             fastq_detail["data_size_bytes"] = total_fastq_size
+            result["total_size_bytes"] += total_fastq_size
         if unreadable_fastq:
             fastq_detail["note"] = f"Permission denied on {len(unreadable_fastq)} fastq dir(s)"
             fastq_detail["inaccessible_dirs"] = unreadable_fastq
@@ -869,47 +1111,30 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
 
     # --- Check for single_read_fast5 (.fast5 in run root or numeric subdirs 0/, 1/, 2/, ...) ---
     # Only check if we didn't already find fast5 via a fast5/ subfolder
-    # Uses os.scandir for speed — single_fast5 dirs can have 100k+ files
+    # Root entries were collected during the discovery walk — single_fast5 dirs
+    # can have 100k+ files, so run_path is not read again here
     if not all_fast5_dirs:
         sample_file = None
         classification = None
-        has_numeric_dirs = False
-        fast5_in_root = False
+        fast5_in_root = root_fast5 is not None
 
-        try:
-            with os.scandir(run_path) as it:
-                for entry in it:
-                    # Check for .fast5 file in root (just need one for classification)
-                    if not sample_file and entry.is_file(follow_symlinks=False) and entry.name.endswith(".fast5"):
-                        # Quick size check
-                        size_bytes = entry.stat(follow_symlinks=False).st_size
-                        classification = "single_read_fast5" if size_bytes < 1_000_000 else "multi_read_fast5"
-                        sample_file = Path(entry.path)
-                        fast5_in_root = True
-                    # Check for numeric subdirectory
-                    elif not has_numeric_dirs and entry.is_dir(follow_symlinks=False) and re.match(r"^\d+$", entry.name):
-                        has_numeric_dirs = True
-                        # Try to find and classify a .fast5 inside this numeric dir
-                        if not sample_file:
-                            try:
-                                with os.scandir(entry.path) as sub_it:
-                                    for sub_entry in sub_it:
-                                        if sub_entry.is_file(follow_symlinks=False) and sub_entry.name.endswith(".fast5"):
-                                            size_bytes = sub_entry.stat(follow_symlinks=False).st_size
-                                            classification = "single_read_fast5" if size_bytes < 1_000_000 else "multi_read_fast5"
-                                            sample_file = Path(sub_entry.path)
-                                            break
-                            except PermissionError:
-                                pass
-                    # Stop early once we have what we need
-                    if sample_file:
-                        break
-        except PermissionError:
-            pass
+        if fast5_in_root:
+            sample_file, classification = root_fast5
+        elif first_numeric_dir is not None:
+            # Try to find and classify a .fast5 inside the first numeric dir
+            try:
+                with os.scandir(first_numeric_dir) as sub_it:
+                    for sub_entry in sub_it:
+                        if sub_entry.is_file(follow_symlinks=False) and sub_entry.name.endswith(".fast5"):
+                            classification = classify_fast5(sub_entry)
+                            sample_file = sub_entry.path
+                            break
+            except PermissionError:
+                pass
 
         if sample_file and classification:
             fast5_info = {
-                "sampled_file": sample_file.name if isinstance(sample_file, Path) else sample_file,
+                "sampled_file": os.path.basename(sample_file),
                 "layout": "root" if fast5_in_root else "numeric_subdirs",
                 "size_based_classification": True,
             }
@@ -919,12 +1144,12 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
                 )
                 fast5_info["file_count"] = count
                 fast5_info["data_size_bytes"] = size
+                result["total_size_bytes"] += size
                 if is_estimated:
                     fast5_info["size_estimated"] = True
 
-            if sample_file and classification and result["chemistry"] is None:
-                sample_path = sample_file if isinstance(sample_file, Path) else run_path / sample_file
-                chem = extract_chemistry(sample_path, "fast5")
+            if result["chemistry"] is None:
+                chem = extract_chemistry(sample_file, "fast5")
                 if chem:
                     result["chemistry"] = chem
                     result["chemistry_classification"] = classify_chemistry(chem)
@@ -938,60 +1163,125 @@ def analyze_run(run_path: Path, quick: bool = False) -> dict:
 
     # --- Check for compressed archives (tar, gz, tar.gz) -- treat as single_read_fast5 ---
     if not fast5_dirs and "single_read_fast5" not in result["formats"]:
-        archive_exts = (".tar", ".gz", ".tar.gz", ".tgz")
-        archives = []
-        try:
-            with os.scandir(run_path) as it:
-                for entry in it:
-                    if entry.is_file(follow_symlinks=False) and any(
-                        entry.name.endswith(ext) for ext in archive_exts
-                    ):
-                        archives.append(Path(entry.path))
-        except PermissionError:
-            pass
-
-        if archives:
+        if archive_names:
             result["formats"].append("single_read_fast5")
             result["details"]["single_read_fast5"] = {
-                "directories": [str(run_path)],
+                "directories": [run_path],
                 "file_count": 0,
-                "archive_files": [f.name for f in archives],
-                "archive_count": len(archives),
+                "archive_files": archive_names,
+                "archive_count": len(archive_names),
                 "note": "Compressed archives found — assumed single-read fast5",
             }
 
+    # Unreadable directories outside the matched format dirs (e.g. a locked
+    # barcode or output dir next to root .fast5 files) mean the run was only
+    # partly read; flag that on every detected format so it shows up in the
+    # verbose output and the TSV notes instead of passing as complete
+    if result["formats"]:
+        format_dirs = set(all_pod5_dirs) | set(all_fast5_dirs) | set(fastq_dirs)
+        other_unreadable = sorted(unreadable - format_dirs)
+        if other_unreadable:
+            note = f"Permission denied on {len(other_unreadable)} dir(s) — run only partly read"
+            for fmt in result["formats"]:
+                detail = result["details"][fmt]
+                detail["inaccessible_dirs"] = detail.get("inaccessible_dirs", []) + other_unreadable
+                detail["note"] = f"{detail['note']}; {note}" if detail.get("note") else note
+
     if not result["formats"]:
         # Gather diagnostic info about what IS in the directory
         diag = diagnose_unknown(run_path)
-        result["formats"].append("unknown")
-        result["details"]["unknown"] = diag
+        inaccessible = diag.get("inaccessible_dirs")
+        if inaccessible and len(inaccessible) == len(diag["subdirectory_names"]):
+            # ALL subdirectories are unreadable
+            result["formats"].append("permission_denied")
+            result["details"]["permission_denied"] = {
+                "reasons": [f"All subdirectories are unreadable ({len(inaccessible)} dir(s))"],
+                "inaccessible_dirs": inaccessible,
+            }
+        else:
+            result["formats"].append("unknown")
+            result["details"]["unknown"] = diag
 
     return result
 
 
-def _has_file_with_ext(directory: Path, ext: str, max_depth: int = 5,
-                       max_entries: int = 10_000) -> bool:
-    """Check if any file with the given extension exists, with depth and iteration limits."""
-    budget = max_entries
+def analyze_runs(run_dirs: list[Path], quick: bool = False,
+                 jobs: int | None = None) -> Iterator[dict]:
+    """
+    Analyze several run directories concurrently, yielding results in run_dirs order.
+
+    analyze_run is dominated by scandir/stat (and h5py open) calls, which
+    release the GIL, so threads overlap I/O latency well -- especially on
+    cold caches and network filesystems. jobs defaults to 4x the CPU count,
+    capped at 32. Parallelism is per run only: the counting calls inside a
+    run stay sequential so a worker never blocks waiting on its own pool.
+
+    All runs are submitted up front, but each result is yielded as soon as
+    it and every run before it are done, so callers can print rows as the
+    scan progresses instead of after the slowest run.
+    """
+    if jobs is None:
+        jobs = min(32, (os.cpu_count() or 4) * 4)
+    with ThreadPoolExecutor(max_workers=jobs) as ex:
+        yield from ex.map(partial(analyze_run, quick=quick), run_dirs)
+
+
+def _has_file_with_ext(directory: Path, ext: str | tuple[str, ...], max_depth: int = 5,
+                       max_entries: int = 10_000) -> bool | None:
+    """Check if any file with the given extension(s) exists, with depth and iteration limits.
+
+    Thin wrapper over _probe_exts(): hidden directories are not descended
+    into, and None is returned instead of False when directory itself
+    cannot be opened.
+    """
+    found = _probe_exts(directory, (ext,) if isinstance(ext, str) else ext,
+                        max_depth, max_entries)
+    return None if found is None else any(found.values())
+
+
+def _probe_exts(directory: str | os.PathLike, exts: tuple[str, ...], max_depth: int = 5,
+                max_entries: int = 10_000) -> dict[str, bool] | None:
+    """Report which of several extensions occur under directory, in one walk.
+
+    Every extension is looked for during a single traversal, which ends as
+    soon as all of them have been seen, so probing a directory for .pod5,
+    .fast5 and .fastq costs one read of each subdirectory, not three.
+    Hidden directories (.snakemake, .git, ...) are not descended into; they
+    never hold run data and would only eat into the max_entries budget. The
+    walk uses an explicit stack, so each directory's files are checked
+    before any of its subdirectories are opened.
 
-    def _search(path: str, depth: int) -> bool:
-        nonlocal budget
-        if depth > max_depth or budget <= 0:
-            return False
+    Returns {ext: seen} or None when directory itself cannot be opened, so
+    callers get its readability from the probe without a separate check.
+    """
+    seen = dict.fromkeys(exts, False)
+    pending = list(exts)
+    budget = max_entries
+    stack = [(os.fspath(directory), 1)]
+    while stack:
+        path, depth = stack.pop()
         try:
             with os.scandir(path) as it:
                 for entry in it:
                     budget -= 1
                     if budget <= 0:
-                        return False
-                    if entry.is_file(follow_symlinks=False) and entry.name.endswith(ext):
-                        return True
-                    if entry.is_dir(follow_symlinks=False) and _search(entry.path, depth + 1):
-                        return True
+                        return seen
+                    name = entry.name
+                    if entry.is_file(follow_symlinks=False):
+                        for ext in pending:
+                            if name.endswith(ext):
+                                seen[ext] = True
+                                pending.remove(ext)
+                                if not pending:
+                                    return seen
+                                break
+                    elif (depth < max_depth and not name.startswith(".")
+                            and entry.is_dir(follow_symlinks=False)):
+                        stack.append((entry.path, depth + 1))
         except PermissionError:
-            pass
-        return False
-    return _search(str(directory), 1)
+            if depth == 1:
+                return None
+    return seen
 
 
 def diagnose_unknown(run_path: Path) -> dict:
@@ -1016,8 +1306,10 @@ def diagnose_unknown(run_path: Path) -> dict:
                     subdirs.append(entry.name)
                 elif entry.is_file(follow_symlinks=False):
                     file_count += 1
-                    dot_pos = entry.name.rfind(".")
-                    ext = entry.name[dot_pos:].lower() if dot_pos >= 0 else "(no extension)"
+                    name = entry.name
+                    dot = name.rfind(".")
+                    # dot > 0: a leading dot marks a hidden file, not an extension
+                    ext = name[dot:].lower() if dot > 0 else "(no extension)"
                     extensions[ext] = extensions.get(ext, 0) + 1
     except PermissionError:
         diag["reasons"].append("Permission denied reading directory")
@@ -1048,12 +1340,25 @@ def diagnose_unknown(run_path: Path) -> dict:
         dir_names = ", ".join(subdirs[:10])
         diag["reasons"].append(f"Subdirectories found: {dir_names}")
 
-        # Check which subdirs are readable
+        # Check which subdirs are readable and whether they hold fast5/pod5
+        # deeper than we searched, in one pass. Each of the first 10 readable
+        # subdirs gets a single bounded walk looking for both extensions (no
+        # unbounded rglob), which also serves as its readability probe;
+        # once both have been found, the rest only need _is_dir_readable().
         unreadable = []
         readable_subdirs = []
+        missing = (".fast5", ".pod5")
+        root = os.fspath(run_path)
         for sd_name in subdirs:
-            sd_path = run_path / sd_name
-            if _is_dir_readable(sd_path):
+            sd_path = os.path.join(root, sd_name)
+            if missing and len(readable_subdirs) < 10:
+                found = _probe_exts(sd_path, missing)
+                readable = found is not None
+                if readable:
+                    missing = tuple(ext for ext in missing if not found[ext])
+            else:
+                readable = _is_dir_readable(sd_path)
+            if readable:
                 readable_subdirs.append(sd_path)
             else:
                 unreadable.append(sd_name)
@@ -1069,10 +1374,8 @@ def diagnose_unknown(run_path: Path) -> dict:
             diag["reasons"].append("All subdirectories are unreadable -- cannot determine format")
             return diag
 
-        # Check if readable subdirs contain fast5/pod5 deeper than we searched.
-        # Uses bounded os.scandir walk instead of unbounded rglob.
-        has_deep_fast5 = any(_has_file_with_ext(sd, ".fast5") for sd in readable_subdirs[:10])
-        has_deep_pod5 = any(_has_file_with_ext(sd, ".pod5") for sd in readable_subdirs[:10])
+        has_deep_fast5 = ".fast5" not in missing
+        has_deep_pod5 = ".pod5" not in missing
 
         if has_deep_fast5:
             diag["reasons"].append("Found .fast5 files deeper in tree but not in expected locations (fast5/, root, or numeric subdirs)")
@@ -1159,8 +1462,34 @@ def _pod5_metadata_fix_lines(pod5_dir: str, chemistry: dict) -> list[str]:
     return lines
 
 
-def generate_conversion_script(runs: dict, target_format: str, output_dir: str | None = None):
-    """Generate a bash conversion script.
+# Per-run command templates for the conversion script, filled with
+# str.format_map() from run_name/fmt/run_path/out/multi_tmp/src
+_TPL_POD5_FROM_MULTI = (
+    "echo 'Converting {run_name} ({fmt} -> pod5)...'",
+    "mkdir -p '{out}'",
+    "pod5 convert fast5 '{run_path}/' --output '{out}/' --threads 20 --recursive",
+)
+_TPL_POD5_FROM_SINGLE = (
+    "echo 'Converting {run_name} ({fmt} -> pod5, two steps)...'",
+    "mkdir -p '{multi_tmp}'",
+    "single_to_multi_fast5 -i '{run_path}' -s '{multi_tmp}' -t 4 --recursive",
+    "mkdir -p '{out}'",
+    "pod5 convert fast5 '{multi_tmp}/' --output '{out}/' --threads 20 --recursive",
+)
+_TPL_POD5_FROM_SINGLE_TAIL = (
+    "# intermediate multi-read fast5 kept in '{multi_tmp}' -- remove manually if no longer needed",
+    "",
+)
+_TPL_SINGLE_FROM_MULTI = (
+    "echo 'Converting {run_name} ({fmt} -> single_fast5)...'",
+    "mkdir -p '{out}'",
+    "multi_to_single_fast5 --input_path '{src}' --save_path '{out}'",
+    "",
+)
+
+
+def _iter_conversion_script_lines(runs: dict, target_format: str, output_dir: str | None = None):
+    """Yield the lines of the bash conversion script one at a time.
 
     When output_dir is provided, all converted files are written under
     <output_dir>/<run_name>/<format>/ instead of alongside the originals.
@@ -1169,121 +1498,134 @@ def generate_conversion_script(runs: dict, target_format: str, output_dir: str |
     post-conversion metadata patching step is included to inject the
     correct flowcell, kit, and sample_rate into the pod5 RunInfo.
     """
-    lines = [
-        "#!/usr/bin/env bash",
-        "# Auto-generated nanopore format conversion script",
-        f"# Target format: {target_format}",
-        "set -euo pipefail",
-        "",
-    ]
+    yield "#!/usr/bin/env bash"
+    yield "# Auto-generated nanopore format conversion script"
+    yield f"# Target format: {target_format}"
+    yield "set -euo pipefail"
+    yield ""
 
     for run_name, info in runs.items():
+        run_path = info.get("run_path", "")
+        chem = info.get("chemistry")
         for fmt in info["formats"]:
             if fmt == target_format:
                 continue  # Already in target format
+            ctx = {"run_name": run_name, "fmt": fmt, "run_path": run_path}
 
             if target_format == "pod5" and fmt == "multi_read_fast5":
-                run_path = info.get("run_path", "")
                 if output_dir:
-                    out = os.path.join(output_dir, run_name, "pod5")
+                    ctx["out"] = os.path.join(output_dir, run_name, "pod5")
                 else:
-                    out = os.path.join(run_path, "pod5")
-                lines.append(f"echo 'Converting {run_name} ({fmt} -> pod5)...'")
-                lines.append(f"mkdir -p '{out}'")
-                lines.append(f"pod5 convert fast5 '{run_path}/' --output '{out}/' --threads 20 --recursive")
+                    ctx["out"] = os.path.join(run_path, "pod5")
+                for t in _TPL_POD5_FROM_MULTI:
+                    yield t.format_map(ctx)
                 # Patch metadata if chemistry was detected from source fast5
-                chem = info.get("chemistry")
                 if chem:
-                    lines.extend(_pod5_metadata_fix_lines(out, chem))
-                lines.append("")
+                    yield from _pod5_metadata_fix_lines(ctx["out"], chem)
+                yield ""
 
             elif target_format == "pod5" and fmt == "single_read_fast5":
-                run_path = info.get("run_path", "")
-                if output_dir:
-                    base = os.path.join(output_dir, run_name)
-                else:
-                    base = run_path
-                multi_tmp = os.path.join(base, "multi_fast5_tmp")
-                out = os.path.join(base, "pod5")
-                lines.append(f"echo 'Converting {run_name} ({fmt} -> pod5, two steps)...'")
-                lines.append(f"mkdir -p '{multi_tmp}'")
-                lines.append(f"single_to_multi_fast5 -i '{run_path}' -s '{multi_tmp}' -t 4 --recursive")
-                lines.append(f"mkdir -p '{out}'")
-                lines.append(f"pod5 convert fast5 '{multi_tmp}/' --output '{out}/' --threads 20 --recursive")
+                base = os.path.join(output_dir, run_name) if output_dir else run_path
+                ctx["multi_tmp"] = os.path.join(base, "multi_fast5_tmp")
+                ctx["out"] = os.path.join(base, "pod5")
+                for t in _TPL_POD5_FROM_SINGLE:
+                    yield t.format_map(ctx)
                 # Patch metadata if chemistry was detected from source fast5
-                chem = info.get("chemistry")
                 if chem:
-                    lines.extend(_pod5_metadata_fix_lines(out, chem))
-                lines.append(f"# intermediate multi-read fast5 kept in '{multi_tmp}' -- remove manually if no longer needed")
-                lines.append("")
+                    yield from _pod5_metadata_fix_lines(ctx["out"], chem)
+                for t in _TPL_POD5_FROM_SINGLE_TAIL:
+                    yield t.format_map(ctx)
 
             elif target_format == "single_fast5" and fmt == "multi_read_fast5":
-                dirs = info["details"].get(fmt, {}).get("directories", [])
-                for d in dirs:
+                for d in info["details"].get(fmt, {}).get("directories", []):
+                    ctx["src"] = d
                     if output_dir:
-                        out = os.path.join(output_dir, run_name, "single_fast5")
+                        ctx["out"] = os.path.join(output_dir, run_name, "single_fast5")
                     else:
-                        out = os.path.join(os.path.dirname(d), "single_fast5")
-                    lines.append(f"echo 'Converting {run_name} ({fmt} -> single_fast5)...'")
-                    lines.append(f"mkdir -p '{out}'")
-                    lines.append(f"multi_to_single_fast5 --input_path '{d}' --save_path '{out}'")
-                    lines.append("")
+                        ctx["out"] = os.path.join(os.path.dirname(d), "single_fast5")
+                    for t in _TPL_SINGLE_FROM_MULTI:
+                        yield t.format_map(ctx)
+
+
+def generate_conversion_script(runs: dict, target_format: str, output_dir: str | None = None):
+    """Generate a bash conversion script and return it as a single string.
+
+    See _iter_conversion_script_lines() for the script contents; use
+    write_conversion_script() to stream a large script straight to disk.
+    """
+    return "\n".join(_iter_conversion_script_lines(runs, target_format, output_dir))
 
-    return "\n".join(lines)
 
+def write_conversion_script(runs: dict, target_format: str, out_path: str,
+                            output_dir: str | None = None) -> None:
+    """Write the bash conversion script to out_path line by line and make it executable.
 
-def write_stats_tsv(all_runs: dict, output_path: str) -> None:
+    Lines are streamed to the file as they are generated, so the whole
+    script is never held in memory for targets with thousands of runs.
+    """
+    with open(out_path, "w") as fh:
+        for line in _iter_conversion_script_lines(runs, target_format, output_dir):
+            fh.write(line)
+            fh.write("\n")
+        os.fchmod(fh.fileno(), 0o755)
+
+
+def write_stats_tsv(all_runs: dict, output: str | os.PathLike | TextIO) -> None:
     """Write per-run statistics to a TSV file.
 
     Produces one row per format per run, so a run containing both pod5 and
-    fastq output generates two rows.
+    fastq output generates two rows. output is a path, or an open text file
+    (opened with newline="") which is written to and left open.
 
     Columns: run_name, format, file_count, data_size_bytes, size_estimated,
     directories, notes
     """
+    if not hasattr(output, "write"):
+        with open(output, "w", newline="") as fh:
+            write_stats_tsv(all_runs, fh)
+        return
     header = ["run_name", "format", "file_count", "data_size_bytes",
               "size_estimated", "directories", "notes",
               "flowcell_code", "sequencing_kit", "sample_rate",
               "pore_type", "dorado_version"]
-    with open(output_path, "w") as fh:
-        fh.write("\t".join(header) + "\n")
-        for run_name, info in all_runs.items():
-            for fmt in info["formats"]:
-                detail = info["details"].get(fmt, {})
-                file_count = detail.get("file_count", "")
-                data_size = detail.get("data_size_bytes", "")
-                estimated = detail.get("size_estimated", "")
-                if estimated is True:
-                    estimated = "True"
-                elif estimated is False or estimated == "":
-                    estimated = ""
-                dirs = ";".join(detail.get("directories", []))
-                # Aggregate notes from multiple fields
-                notes_parts = []
-                if detail.get("note"):
-                    notes_parts.append(detail["note"])
-                for reason in detail.get("reasons", []):
-                    notes_parts.append(reason)
-                for af in detail.get("archive_files", []):
-                    notes_parts.append(f"archive: {af}")
-                notes = "; ".join(notes_parts)
-                chem = info.get("chemistry") or {}
-                chem_class = info.get("chemistry_classification") or {}
-                row = [
-                    run_name,
-                    fmt,
-                    str(file_count),
-                    str(data_size),
-                    str(estimated),
-                    dirs,
-                    notes,
-                    chem.get("flowcell", ""),
-                    chem.get("kit", ""),
-                    str(chem.get("sample_rate", "")) if chem.get("sample_rate") else "",
-                    chem_class.get("pore", ""),
-                    chem_class.get("dorado_version", "") or "",
-                ]
-                fh.write("\t".join(row) + "\n")
+    rows = []
+    for run_name, info in all_runs.items():
+        # Per-run fields are looked up once and shared by every format row
+        details = info["details"]
+        chem = info.get("chemistry") or {}
+        chem_class = info.get("chemistry_classification") or {}
+        chem_fields = (
+            chem.get("flowcell", ""),
+            chem.get("kit", ""),
+            chem.get("sample_rate") or "",
+            chem_class.get("pore", ""),
+            chem_class.get("dorado_version", "") or "",
+        )
+        for fmt in info["formats"]:
+            get = details.get(fmt, {}).get
+            # Aggregate notes from multiple fields
+            notes_parts = []
+            if get("note"):
+                notes_parts.append(get("note"))
+            notes_parts.extend(get("reasons", []))
+            notes_parts.extend(f"archive: {af}" for af in get("archive_files", []))
+            if get("file_count_capped"):
+                notes_parts.append("file count and size are lower bounds (count capped)")
+            rows.append((
+                run_name,
+                fmt,
+                get("file_count", ""),
+                get("data_size_bytes", ""),
+                "True" if get("size_estimated") is True else "",
+                ";".join(get("directories", [])),
+                "; ".join(notes_parts),
+                *chem_fields,
+            ))
+    # csv.writer formats and joins each row in C; fields containing a tab,
+    # newline or quote are quoted instead of silently breaking the row
+    writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
 
 
 def main():
@@ -1326,7 +1668,16 @@ def main():
         metavar="FILE",
         help="Write per-run statistics to a TSV file",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of runs to analyze in parallel (default: 4x CPU count, max 32)",
+    )
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
 
     target = Path(args.target_folder)
     if not target.is_dir():
@@ -1338,18 +1689,21 @@ def main():
               file=sys.stderr)
         print("  Install with: pip install h5py\n", file=sys.stderr)
 
-    # Find nanopore run directories
-    run_dirs = sorted(
-        [d for d in target.iterdir() if d.is_dir() and is_nanopore_run_dir(d.name)]
-    )
-
-    # Find compressed archives in target folder — treat as single_read_fast5 runs
-    archive_exts = (".tar", ".gz", ".tar.gz", ".tgz")
-    archive_files = sorted(
-        [f for f in target.iterdir()
-         if f.is_file() and any(f.name.endswith(ext) for ext in archive_exts)
-         and is_nanopore_run_dir(f.name)]
-    )
+    # Find nanopore run directories and compressed archives (treated as
+    # single_read_fast5 runs) in one scandir pass; is_dir()/is_file() are
+    # answered from d_type, so only symlinked entries are stat()ed
+    run_dirs = []
+    archive_files = []
+    with os.scandir(target) as it:
+        for entry in it:
+            if not is_nanopore_run_dir(entry.name):
+                continue
+            if entry.is_dir():
+                run_dirs.append(Path(entry.path))
+            elif entry.is_file() and entry.name.endswith(ARCHIVE_EXTENSIONS):
+                archive_files.append(Path(entry.path))
+    run_dirs.sort()
+    archive_files.sort()
 
     if not run_dirs and not archive_files:
         print(f"No nanopore run directories found in '{target}'")
@@ -1361,41 +1715,42 @@ def main():
     print("-" * 120)
 
     all_runs = {}
-    format_summary = {"pod5": 0, "multi_read_fast5": 0, "single_read_fast5": 0,
-                       "fastq": 0, "fast5_unknown": 0, "permission_denied": 0, "unknown": 0}
+    # Seeded with zeros so the summary keeps this order; unexpected formats go last.
+    format_summary = Counter(dict.fromkeys(
+        ("pod5", "multi_read_fast5", "single_read_fast5", "fastq",
+         "fast5_unknown", "permission_denied", "unknown"), 0))
 
-    for run_dir in run_dirs:
-        result = analyze_run(run_dir, quick=args.quick)
-
-        # Sum recognized format data sizes (unless --quick)
-        if not args.quick:
-            result["total_size_bytes"] = sum(
-                detail.get("data_size_bytes", 0)
-                for detail in result["details"].values()
-            )
+    # A lazy iterator: each row is printed as soon as its run (and every run
+    # before it) is done, not after the whole scan
+    results = analyze_runs(run_dirs, quick=args.quick, jobs=args.jobs)
 
+    for run_dir, result in zip(run_dirs, results):
         all_runs[run_dir.name] = result
 
         formats_str = ", ".join(result["formats"])
+        format_summary.update(result["formats"])
         file_counts = []
         for fmt in result["formats"]:
             detail = result["details"].get(fmt, {})
             count = detail.get("file_count")
             if count:
-                file_counts.append(f"{count}")
-            format_summary[fmt] = format_summary.get(fmt, 0) + 1
+                file_counts.append(f"{count}+" if detail.get("file_count_capped") else f"{count}")
 
         count_str = " / ".join(file_counts) if file_counts else "-"
+        # A partly readable run must not look complete in the table
+        inaccessible = {d for detail in result["details"].values()
+                        for d in detail.get("inaccessible_dirs", ())}
+        if inaccessible:
+            count_str += f" (⚠ {len(inaccessible)} unreadable dir(s))"
         size_str = format_size(result["total_size_bytes"]) if "total_size_bytes" in result else "-"
-        if any(d.get("size_estimated") for d in result["details"].values()):
+        if any(d.get("file_count_capped") for d in result["details"].values()):
+            size_str = ">" + size_str
+        elif any(d.get("size_estimated") for d in result["details"].values()):
             size_str = "~" + size_str
 
         chem_class = result.get("chemistry_classification")
-        if chem_class and chem_class["pore"] != "unknown":
-            chem_str = chem_class["pore"]
-            rate = result.get("chemistry", {}).get("sample_rate", 0)
-            if rate:
-                chem_str += f" {rate // 1000}kHz"
+        if chem_class:
+            chem_str = _chemistry_label(chem_class["pore"], result["chemistry"].get("sample_rate") or 0)
         else:
             chem_str = "-"
 
@@ -1430,7 +1785,12 @@ def main():
                         for a in detail["archive_files"]:
                             print(f"  +-- {a}")
                     if "data_size_bytes" in detail:
-                        prefix = "~" if detail.get("size_estimated") else ""
+                        if detail.get("file_count_capped"):
+                            prefix = ">"
+                        elif detail.get("size_estimated"):
+                            prefix = "~"
+                        else:
+                            prefix = ""
                         print(f"  data size: {prefix}{format_size(detail['data_size_bytes'])}")
                     if "note" in detail:
                         print(f"  note: {detail['note']}")
@@ -1480,7 +1840,7 @@ def main():
                 pass
 
         all_runs[name] = result
-        format_summary["single_read_fast5"] = format_summary.get("single_read_fast5", 0) + 1
+        format_summary["single_read_fast5"] += 1
         arc_size_str = format_size(result["total_size_bytes"]) if "total_size_bytes" in result else "-"
         print(f"{archive.name:<55} {'single_read_fast5 (archive)':<25} {'-':<18} {arc_size_str:<12} -")
 
@@ -1498,10 +1858,8 @@ def main():
 
     # Generate conversion script if requested
     if args.convert_to:
-        script = generate_conversion_script(all_runs, args.convert_to, args.output_dir)
         script_path = Path(args.script_output)
-        script_path.write_text(script)
-        script_path.chmod(0o755)
+        write_conversion_script(all_runs, args.convert_to, script_path, args.output_dir)
         print(f"\nConversion script written to: {script_path}")
         print(f"  Review and run: bash {script_path}")
 
@@ -6,25 +6,36 @@ Creates mock directory trees to verify all format detection paths work
 correctly after the os.scandir optimization changes.
 """
 
+import argparse
+import csv
+import io
 import os
-import stat
+import shutil
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
+from unittest import mock
+
+import h5py
 
 # Import the checker module from the same directory
 sys.path.insert(0, str(Path(__file__).parent))
-import io
-
 from nanopore_format_checker import (
+    _chemistry_label,
     _has_file_with_ext,
+    _probe_exts,
     analyze_run,
+    analyze_runs,
     classify_chemistry,
+    classify_fast5,
+    classify_fast5_from_size,
     compute_dir_size,
+    count_files_in_dirs,
     diagnose_unknown,
     discover_run_structure,
     estimate_dir_size,
-    extract_chemistry,
     extract_chemistry_fast5,
     extract_chemistry_pod5,
     fast_count_files,
@@ -32,35 +43,97 @@ from nanopore_format_checker import (
     format_size,
     generate_conversion_script,
     print_conversion_help,
+    write_conversion_script,
     write_stats_tsv,
 )
 
 
+def _create_file(path: str | os.PathLike, size: int) -> None:
+    """Create path holding size zero bytes.
+
+    Most fixtures are sized with ftruncate() instead of written, so they
+    read back as zeros without any data blocks being allocated; the checker
+    only looks at st_size. .pod5 files are the exception: the pod5 library
+    warns about sparse files when chemistry extraction opens them, so they
+    are written out (and kept small).
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if os.fspath(path).endswith(".pod5"):
+            os.write(fd, bytes(size))
+        else:
+            os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+
+
 def make_file(path: Path, size: int = 100) -> None:
-    """Create a file with the given size in bytes."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(b"\x00" * size)
+    """Create a file with the given size in bytes (see _create_file), making parents as needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _create_file(path, size)
+
+
+def make_tree(root: Path, spec: dict[str, int | None]) -> None:
+    """Create a fixture tree under root from a {relative path: size} spec.
+
+    A size of None makes an (empty) directory instead of a file. Paths are
+    joined as strings.
+    """
+    root = os.fspath(root)
+    for rel, size in spec.items():
+        path = os.path.join(root, rel)
+        if size is None:
+            os.makedirs(path, exist_ok=True)
+        else:
+            make_file(path, size=size)
+
+
+def make_many(directory: Path, count: int, name: str, size: int = 100) -> None:
+    """Create count files of the given size in directory.
+
+    name is a str.format template taking the file index, e.g.
+    "read_{:04d}.fast5". The directory is created once and files are made
+    from pre-joined string paths, so bulk fixtures skip the per-file Path
+    building and parent checks of make_file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, "")
+    for i in range(count):
+        _create_file(base + name.format(i), size)
+
+
+def make_fast5(path: Path, group: str = "UniqueGlobalKey", context_tags: dict | None = None,
+               tracking_id: dict | None = None) -> None:
+    """Create a minimal fast5 holding context_tags/tracking_id attributes under group.
+
+    group is "UniqueGlobalKey" for the single-read layout or a read_<id>
+    group for a multi-read file. Groups whose attributes are None are left out.
+    The file is built in memory (core driver) and written out once on close.
+    """
+    os.makedirs(path.parent, exist_ok=True)
+    with h5py.File(path, "w", driver="core", backing_store=True) as f:
+        for name, attrs in (("context_tags", context_tags), ("tracking_id", tracking_id)):
+            if attrs is not None:
+                f.create_group(f"{group}/{name}").attrs.update(attrs)
 
 
 def test_pod5_subdirectory(tmp_path: Path) -> None:
-    """Run with pod5/ subdirectory containing .pod5 files."""
+    """Run with pod5/ subdirectory containing .pod5 files, with sizes."""
     run = tmp_path / "20240101_run_pod5"
-    (run / "pod5").mkdir(parents=True)
-    make_file(run / "pod5" / "reads_001.pod5", size=5_000_000)
-    make_file(run / "pod5" / "reads_002.pod5", size=5_000_000)
+    make_tree(run, {"pod5/reads_001.pod5": 5000, "pod5/reads_002.pod5": 2000})
 
     result = analyze_run(run)
     assert "pod5" in result["formats"], f"Expected pod5, got {result['formats']}"
-    assert result["details"]["pod5"]["file_count"] == 2
+    detail = result["details"]["pod5"]
+    assert detail["file_count"] == 2
+    assert detail.get("data_size_bytes") == 7000, f"Expected 7000, got {detail.get('data_size_bytes')}"
     print("  PASS: pod5 subdirectory")
 
 
 def test_pod5_variant_dirs(tmp_path: Path) -> None:
     """Run with pod5_pass/ and pod5_fail/ variant directories."""
     run = tmp_path / "20240101_run_pod5var"
-    (run / "pod5_pass").mkdir(parents=True)
-    (run / "pod5_fail").mkdir(parents=True)
-    make_file(run / "pod5_pass" / "reads.pod5", size=5_000_000)
+    make_tree(run, {"pod5_pass/reads.pod5": 5000, "pod5_fail": None})
 
     result = analyze_run(run)
     assert "pod5" in result["formats"], f"Expected pod5, got {result['formats']}"
@@ -72,10 +145,8 @@ def test_pod5_variant_dirs(tmp_path: Path) -> None:
 def test_multi_read_fast5(tmp_path: Path) -> None:
     """Run with fast5/ containing multi-read fast5 files (>1MB each)."""
     run = tmp_path / "20240101_run_multi"
-    (run / "fast5").mkdir(parents=True)
     # Multi-read fast5 files are >1MB
-    make_file(run / "fast5" / "batch_001.fast5", size=2_000_000)
-    make_file(run / "fast5" / "batch_002.fast5", size=2_000_000)
+    make_tree(run, {"fast5/batch_001.fast5": 2_000_000, "fast5/batch_002.fast5": 2_000_000})
 
     result = analyze_run(run)
     assert "multi_read_fast5" in result["formats"], f"Expected multi_read_fast5, got {result['formats']}"
@@ -84,40 +155,39 @@ def test_multi_read_fast5(tmp_path: Path) -> None:
 
 
 def test_single_read_fast5_in_fast5_dir(tmp_path: Path) -> None:
-    """Run with fast5/ containing single-read fast5 files (<1MB each)."""
+    """Run with fast5/ containing single-read fast5 files (<1MB each), with sizes."""
     run = tmp_path / "20240101_run_single_f5dir"
-    (run / "fast5").mkdir(parents=True)
     # Single-read fast5 files are <1MB (typically 1-50KB)
-    for i in range(10):
-        make_file(run / "fast5" / f"read_{i:04d}.fast5", size=30_000)
+    make_many(run / "fast5", 10, "read_{:04d}.fast5", size=30_000)
 
     result = analyze_run(run)
     assert "single_read_fast5" in result["formats"], f"Expected single_read_fast5, got {result['formats']}"
+    detail = result["details"]["single_read_fast5"]
+    assert detail["file_count"] == 10, f"Expected 10, got {detail.get('file_count')}"
+    assert detail.get("data_size_bytes") == 300_000, f"Expected 300000, got {detail.get('data_size_bytes')}"
     print("  PASS: single-read fast5 in fast5/ subdirectory")
 
 
 def test_single_read_fast5_in_root(tmp_path: Path) -> None:
-    """Run with .fast5 files directly in root (no fast5/ subdirectory)."""
+    """Run with .fast5 files directly in root (no fast5/ subdirectory), with sizes."""
     run = tmp_path / "20240101_run_single_root"
-    run.mkdir(parents=True)
-    for i in range(10):
-        make_file(run / f"read_{i:04d}.fast5", size=30_000)
+    make_many(run, 10, "read_{:04d}.fast5", size=30_000)
 
     result = analyze_run(run)
     assert "single_read_fast5" in result["formats"], f"Expected single_read_fast5, got {result['formats']}"
-    assert result["details"]["single_read_fast5"]["layout"] == "root"
+    detail = result["details"]["single_read_fast5"]
+    assert detail["layout"] == "root"
+    assert detail["file_count"] == 10, f"Expected 10, got {detail.get('file_count')}"
+    assert detail.get("data_size_bytes") == 300_000, f"Expected 300000, got {detail.get('data_size_bytes')}"
     print("  PASS: single-read fast5 in root")
 
 
 def test_single_read_fast5_numeric_subdirs(tmp_path: Path) -> None:
     """Run with numeric subdirs (0/, 1/, 2/) containing .fast5 files."""
     run = tmp_path / "20240101_run_single_numeric"
-    run.mkdir(parents=True)
     for subdir in range(3):
         d = run / str(subdir)
-        d.mkdir()
-        for i in range(5):
-            make_file(d / f"read_{i:04d}.fast5", size=30_000)
+        make_many(d, 5, "read_{:04d}.fast5", size=30_000)
 
     result = analyze_run(run)
     assert "single_read_fast5" in result["formats"], f"Expected single_read_fast5, got {result['formats']}"
@@ -128,9 +198,7 @@ def test_single_read_fast5_numeric_subdirs(tmp_path: Path) -> None:
 def test_fast5_variant_dirs(tmp_path: Path) -> None:
     """Run with fast5_pass/ and fast5_fail/ variant directories."""
     run = tmp_path / "20240101_run_f5var"
-    (run / "fast5_pass").mkdir(parents=True)
-    (run / "fast5_fail").mkdir(parents=True)
-    make_file(run / "fast5_pass" / "batch.fast5", size=2_000_000)
+    make_tree(run, {"fast5_pass/batch.fast5": 2_000_000, "fast5_fail": None})
 
     result = analyze_run(run)
     assert "multi_read_fast5" in result["formats"], f"Expected multi_read_fast5, got {result['formats']}"
@@ -142,7 +210,6 @@ def test_fast5_variant_dirs(tmp_path: Path) -> None:
 def test_compressed_archives(tmp_path: Path) -> None:
     """Run with compressed archives in run directory."""
     run = tmp_path / "20240101_run_archives"
-    run.mkdir(parents=True)
     make_file(run / "reads.tar.gz", size=1000)
     make_file(run / "more_reads.tgz", size=1000)
 
@@ -152,10 +219,24 @@ def test_compressed_archives(tmp_path: Path) -> None:
     print("  PASS: compressed archives")
 
 
+def test_analyze_runs_preserves_order(tmp_path: Path) -> None:
+    """Parallel analysis should return one result per run, in input order."""
+    pod5_run = tmp_path / "20240101_run_par_pod5"
+    make_file(pod5_run / "pod5" / "a.pod5", size=100)
+    fastq_run = tmp_path / "20240102_run_par_fastq"
+    make_file(fastq_run / "fastq_pass" / "a.fastq.gz", size=100)
+
+    results = list(analyze_runs([pod5_run, fastq_run, pod5_run], jobs=2))
+    assert [r["formats"] for r in results] == [["pod5"], ["fastq"], ["pod5"]], \
+        f"Unexpected results order: {[r['formats'] for r in results]}"
+    assert results[1]["run_path"] == str(fastq_run)
+    print("  PASS: analyze_runs preserves order")
+
+
 def test_empty_directory(tmp_path: Path) -> None:
     """Run with empty directory."""
     run = tmp_path / "20240101_run_empty"
-    run.mkdir(parents=True)
+    run.mkdir()
 
     result = analyze_run(run)
     assert "unknown" in result["formats"], f"Expected unknown, got {result['formats']}"
@@ -163,26 +244,26 @@ def test_empty_directory(tmp_path: Path) -> None:
 
 
 def test_fastq_directory(tmp_path: Path) -> None:
-    """Run with fastq_pass/ directory."""
+    """Run with fastq_pass/ directory, with sizes."""
     run = tmp_path / "20240101_run_fastq"
-    (run / "fastq_pass").mkdir(parents=True)
-    make_file(run / "fastq_pass" / "reads_001.fastq.gz", size=1000)
-    make_file(run / "fastq_pass" / "reads_002.fastq.gz", size=1000)
-    make_file(run / "fastq_pass" / "reads_003.fq", size=1000)
+    make_tree(run, {
+        "fastq_pass/reads_001.fastq.gz": 1000,
+        "fastq_pass/reads_002.fastq.gz": 1000,
+        "fastq_pass/reads_003.fq": 500,
+    })
 
     result = analyze_run(run)
     assert "fastq" in result["formats"], f"Expected fastq, got {result['formats']}"
-    assert result["details"]["fastq"]["file_count"] == 3
+    detail = result["details"]["fastq"]
+    assert detail["file_count"] == 3
+    assert detail.get("data_size_bytes") == 2500, f"Expected 2500, got {detail.get('data_size_bytes')}"
     print("  PASS: fastq directory")
 
 
 def test_mixed_formats(tmp_path: Path) -> None:
     """Run with both pod5 and fast5 directories (both formats detected)."""
     run = tmp_path / "20240101_run_mixed"
-    (run / "pod5").mkdir(parents=True)
-    (run / "fast5").mkdir(parents=True)
-    make_file(run / "pod5" / "reads.pod5", size=5_000_000)
-    make_file(run / "fast5" / "reads.fast5", size=2_000_000)
+    make_tree(run, {"pod5/reads.pod5": 5000, "fast5/reads.fast5": 2_000_000})
 
     result = analyze_run(run)
     assert "pod5" in result["formats"], f"Expected pod5 in {result['formats']}"
@@ -194,8 +275,7 @@ def test_nested_pod5(tmp_path: Path) -> None:
     """Run with pod5 directory nested several levels deep."""
     run = tmp_path / "20240101_run_nested"
     nested = run / "output" / "basecalling" / "pod5"
-    nested.mkdir(parents=True)
-    make_file(nested / "reads.pod5", size=5_000_000)
+    make_file(nested / "reads.pod5", size=5000)
 
     result = analyze_run(run)
     assert "pod5" in result["formats"], f"Expected pod5, got {result['formats']}"
@@ -205,7 +285,6 @@ def test_nested_pod5(tmp_path: Path) -> None:
 def test_find_named_subdirs_skips_files(tmp_path: Path) -> None:
     """Verify find_named_subdirs only matches directories, not files."""
     run = tmp_path / "20240101_run_findtest"
-    run.mkdir(parents=True)
     # Create a file named "fast5" (not a directory)
     make_file(run / "fast5", size=100)
     # Create a directory named "fast5_pass"
@@ -234,9 +313,7 @@ def test_fast5_with_numeric_subdirs(tmp_path: Path) -> None:
     fast5_dir = run / "fast5"
     for subdir in range(3):
         d = fast5_dir / str(subdir)
-        d.mkdir(parents=True)
-        for i in range(5):
-            make_file(d / f"read_{i:04d}.fast5", size=30_000)
+        make_many(d, 5, "read_{:04d}.fast5", size=30_000)
 
     result = analyze_run(run)
     assert "single_read_fast5" in result["formats"], f"Expected single_read_fast5, got {result['formats']}"
@@ -248,19 +325,18 @@ def test_many_files_in_root_performance(tmp_path: Path) -> None:
     """Simulate a directory with many small files to verify the scan is not slow."""
     import time
     run = tmp_path / "20240101_run_perf"
-    run.mkdir(parents=True)
     # Create 1000 small files (smaller than real 100k but enough to test the path)
-    for i in range(1000):
-        make_file(run / f"read_{i:06d}.fast5", size=100)
+    make_many(run, 1000, "read_{:06d}.fast5", size=100)
 
-    start = time.monotonic()
+    start = time.perf_counter_ns()
     result = analyze_run(run)
-    elapsed = time.monotonic() - start
+    elapsed_ns = time.perf_counter_ns() - start
 
     assert "single_read_fast5" in result["formats"], f"Expected single_read_fast5, got {result['formats']}"
-    # Should complete in well under 5 seconds even with 1000 files
-    assert elapsed < 5.0, f"Took too long: {elapsed:.2f}s"
-    print(f"  PASS: 1000 files in root ({elapsed:.3f}s)")
+    # The scan takes a few ms here; 0.5 s still leaves headroom for slow
+    # CI machines but catches an order-of-magnitude regression
+    assert elapsed_ns < 500_000_000, f"Took too long: {elapsed_ns / 1e9:.3f}s"
+    print(f"  PASS: 1000 files in root ({elapsed_ns / 1e9:.3f}s)")
 
 
 def test_diagnose_unknown_with_deep_fast5(tmp_path: Path) -> None:
@@ -268,7 +344,6 @@ def test_diagnose_unknown_with_deep_fast5(tmp_path: Path) -> None:
     run = tmp_path / "20240101_run_deep"
     # Create a non-standard directory structure
     deep = run / "custom_output" / "data" / "reads"
-    deep.mkdir(parents=True)
     make_file(deep / "read_001.fast5", size=30_000)
 
     result = analyze_run(run)
@@ -282,15 +357,15 @@ def test_diagnose_unknown_with_deep_fast5(tmp_path: Path) -> None:
 def test_discover_run_structure(tmp_path: Path) -> None:
     """Verify single-walk discovery finds all format categories."""
     run = tmp_path / "20240101_run_discover"
-    (run / "pod5").mkdir(parents=True)
-    (run / "pod5_pass").mkdir(parents=True)
-    (run / "fast5").mkdir(parents=True)
-    (run / "fast5_fail").mkdir(parents=True)
-    (run / "fastq_pass").mkdir(parents=True)
-    # Nested pod5 inside a subdir
-    (run / "output" / "pod5").mkdir(parents=True)
-    # Non-matching directory
-    (run / "logs").mkdir(parents=True)
+    make_tree(run, {
+        "pod5": None,
+        "pod5_pass": None,
+        "fast5": None,
+        "fast5_fail": None,
+        "fastq_pass": None,
+        "output/pod5": None,  # nested pod5 inside a subdir
+        "logs": None,  # non-matching directory
+    })
 
     structure = discover_run_structure(run)
     assert len(structure["pod5"]) == 2, f"Expected 2 pod5 dirs, got {structure['pod5']}"
@@ -304,7 +379,6 @@ def test_discover_run_structure(tmp_path: Path) -> None:
 def test_fast_count_files_returns_size(tmp_path: Path) -> None:
     """Verify fast_count_files returns (count, size) tuple."""
     d = tmp_path / "20240101_run_count_size" / "data"
-    d.mkdir(parents=True)
     make_file(d / "a.pod5", size=1000)
     make_file(d / "b.pod5", size=2000)
     make_file(d / "c.txt", size=500)  # should not match
@@ -318,8 +392,6 @@ def test_fast_count_files_returns_size(tmp_path: Path) -> None:
 def test_fast_count_files_recursive_size(tmp_path: Path) -> None:
     """Verify recursive counting also accumulates size."""
     base = tmp_path / "20240101_run_recsize" / "data"
-    (base / "sub1").mkdir(parents=True)
-    (base / "sub2").mkdir(parents=True)
     make_file(base / "a.pod5", size=100)
     make_file(base / "sub1" / "b.pod5", size=200)
     make_file(base / "sub2" / "c.pod5", size=300)
@@ -330,6 +402,66 @@ def test_fast_count_files_recursive_size(tmp_path: Path) -> None:
     print("  PASS: fast_count_files recursive with size")
 
 
+def test_fast_count_files_max_count(tmp_path: Path) -> None:
+    """Verify fast_count_files stops early once max_count matches are seen."""
+    base = tmp_path / "20240101_run_maxcount" / "data"
+    make_many(base, 5, "a_{}.pod5")
+    make_many(base / "sub", 5, "b_{}.pod5")
+
+    count, size = fast_count_files(base, ext=".pod5", recursive=True, max_count=3)
+    assert count == 3, f"Expected count capped at 3, got {count}"
+    assert size == 300, f"Expected size=300 for capped count, got {size}"
+
+    count, _ = fast_count_files(base, ext=".pod5", recursive=True, max_count=100)
+    assert count == 10, f"Expected full count=10 below cap, got {count}"
+    print("  PASS: fast_count_files max_count")
+
+
+def test_count_files_in_dirs(tmp_path: Path) -> None:
+    """Verify count_files_in_dirs sums across directories and flags per-dir caps."""
+    run = tmp_path / "20240101_run_multi_count"
+    make_many(run / "pod5_pass", 4, "a_{}.pod5")
+    make_file(run / "pod5_fail" / "b.pod5", size=50)
+    dirs = [str(run / "pod5_pass"), str(run / "pod5_fail")]
+
+    assert count_files_in_dirs(dirs, ".pod5") == (5, 450, False)
+    count, _, capped = count_files_in_dirs(dirs, ".pod5", max_count=2)
+    assert count == 3 and capped, f"Expected per-dir cap (2 + 1), got {count}, capped={capped}"
+    print("  PASS: count_files_in_dirs")
+
+
+def test_fast_count_files_max_depth(tmp_path: Path) -> None:
+    """Verify fast_count_files does not descend past max_depth levels."""
+    base = tmp_path / "20240101_run_maxdepth" / "pod5"
+    make_file(base / "a.pod5", size=100)
+    make_file(base / "l2" / "b.pod5", size=100)
+    make_file(base / "l2" / "l3" / "c.pod5", size=100)
+    make_file(base / "l2" / "l3" / "l4" / "d.pod5", size=100)
+
+    count, _ = fast_count_files(base, ext=".pod5", recursive=True, max_depth=3)
+    assert count == 3, f"Expected 3 files within depth 3, got {count}"
+    count, _ = fast_count_files(base, ext=".pod5", recursive=True, max_depth=4)
+    assert count == 4, f"Expected 4 files within depth 4, got {count}"
+    print("  PASS: fast_count_files max_depth")
+
+
+def test_classify_fast5_from_size(tmp_path: Path) -> None:
+    """Verify the 1 MB single/multi-read threshold on precomputed sizes."""
+    assert classify_fast5_from_size(0) == "single_read_fast5"
+    assert classify_fast5_from_size(999_999) == "single_read_fast5"
+    assert classify_fast5_from_size(1_000_000) == "multi_read_fast5"
+    assert classify_fast5_from_size(50_000_000) == "multi_read_fast5"
+
+    # classify_fast5 accepts a size, a DirEntry or a path
+    make_file(tmp_path / "small.fast5", size=100)
+    with os.scandir(tmp_path) as it:
+        entry = next(e for e in it if e.name == "small.fast5")
+    assert classify_fast5(entry) == "single_read_fast5"
+    assert classify_fast5(tmp_path / "small.fast5") == "single_read_fast5"
+    assert classify_fast5(2_000_000) == "multi_read_fast5"
+    print("  PASS: classify_fast5_from_size")
+
+
 def test_format_size(tmp_path: Path) -> None:
     """Verify human-readable size formatting."""
     assert format_size(0) == "0 B"
@@ -342,10 +474,17 @@ def test_format_size(tmp_path: Path) -> None:
     print("  PASS: format_size")
 
 
+def test_chemistry_label(tmp_path: Path) -> None:
+    """Verify the chemistry column label."""
+    assert _chemistry_label("R10.4.1", 5000) == "R10.4.1 5kHz"
+    assert _chemistry_label("R9.4.1", 0) == "R9.4.1"
+    assert _chemistry_label("unknown", 4000) == "-"
+    print("  PASS: chemistry label")
+
+
 def test_compute_dir_size(tmp_path: Path) -> None:
     """Verify total directory size calculation."""
     run = tmp_path / "20240101_run_dirsize"
-    (run / "sub").mkdir(parents=True)
     make_file(run / "a.txt", size=100)
     make_file(run / "sub" / "b.txt", size=200)
 
@@ -357,8 +496,7 @@ def test_compute_dir_size(tmp_path: Path) -> None:
 def test_quick_mode(tmp_path: Path) -> None:
     """Verify quick mode returns formats without counts or sizes."""
     run = tmp_path / "20240101_run_quick"
-    (run / "pod5").mkdir(parents=True)
-    make_file(run / "pod5" / "reads.pod5", size=5_000_000)
+    make_file(run / "pod5" / "reads.pod5", size=5000)
 
     result = analyze_run(run, quick=True)
     assert "pod5" in result["formats"], f"Expected pod5, got {result['formats']}"
@@ -368,35 +506,6 @@ def test_quick_mode(tmp_path: Path) -> None:
     print("  PASS: quick mode")
 
 
-def test_size_in_pod5_result(tmp_path: Path) -> None:
-    """Verify data_size_bytes appears in pod5 detail when not in quick mode."""
-    run = tmp_path / "20240101_run_pod5size"
-    (run / "pod5").mkdir(parents=True)
-    make_file(run / "pod5" / "reads_001.pod5", size=1000)
-    make_file(run / "pod5" / "reads_002.pod5", size=2000)
-
-    result = analyze_run(run)
-    assert "pod5" in result["formats"]
-    detail = result["details"]["pod5"]
-    assert detail["file_count"] == 2
-    assert detail["data_size_bytes"] == 3000, f"Expected 3000, got {detail.get('data_size_bytes')}"
-    print("  PASS: data_size_bytes in pod5 result")
-
-
-def test_size_in_fastq_result(tmp_path: Path) -> None:
-    """Verify data_size_bytes appears in fastq detail."""
-    run = tmp_path / "20240101_run_fqsize"
-    (run / "fastq_pass").mkdir(parents=True)
-    make_file(run / "fastq_pass" / "reads.fastq.gz", size=500)
-
-    result = analyze_run(run)
-    assert "fastq" in result["formats"]
-    detail = result["details"]["fastq"]
-    assert detail["file_count"] == 1
-    assert detail["data_size_bytes"] == 500, f"Expected 500, got {detail.get('data_size_bytes')}"
-    print("  PASS: data_size_bytes in fastq result")
-
-
 def test_discover_skips_data_dirs(tmp_path: Path) -> None:
     """Verify discover_run_structure does not recurse into matched data directories."""
     run = tmp_path / "20240101_run_skipdata"
@@ -433,16 +542,15 @@ def test_find_named_subdirs_skips_matched(tmp_path: Path) -> None:
 def test_has_file_with_ext_budget(tmp_path: Path) -> None:
     """Verify _has_file_with_ext stops searching after budget is exhausted."""
     d = tmp_path / "20240101_run_budget"
-    d.mkdir(parents=True)
     # Create 20 non-matching files
-    for i in range(20):
-        make_file(d / f"file_{i:04d}.txt", size=10)
-    # Place a matching file that would only be found after budget runs out
-    make_file(d / "zzz_last.fast5", size=10)
+    make_many(d, 20, "file_{:04d}.txt", size=10)
+    # Place a matching file in a subdir: a directory's own entries are
+    # always read before its subdirs, whatever order readdir returns them in
+    make_file(d / "sub" / "last.fast5", size=10)
 
     # With budget of 5, should not find the .fast5 file (it comes after many .txt files)
     found = _has_file_with_ext(d, ".fast5", max_entries=5)
-    assert not found, "Should not find .fast5 with budget=5"
+    assert found is False, "Should not find .fast5 with budget=5"
 
     # With default budget, should find it
     found = _has_file_with_ext(d, ".fast5")
@@ -450,25 +558,120 @@ def test_has_file_with_ext_budget(tmp_path: Path) -> None:
     print("  PASS: _has_file_with_ext budget")
 
 
+def test_has_file_with_ext_skips_hidden_dirs(tmp_path: Path) -> None:
+    """Verify _has_file_with_ext accepts a tuple and ignores hidden directories."""
+    d = tmp_path / "20240101_run_hidden"
+    make_file(d / ".cache" / "reads.fast5", size=10)
+    assert not _has_file_with_ext(d, ".fast5"), "Should not search hidden directories"
+
+    make_file(d / "sub" / "reads.pod5", size=10)
+    assert _has_file_with_ext(d, (".fast5", ".pod5")), "Should match any extension in tuple"
+    print("  PASS: _has_file_with_ext skips hidden dirs")
+
+
+def test_probe_exts(tmp_path: Path) -> None:
+    """Verify _probe_exts reports every extension seen in one bounded walk."""
+    d = tmp_path / "20240101_run_probe"
+    make_file(d / "a" / "b" / "reads.fast5", size=10)
+    make_file(d / ".hidden" / "reads.pod5", size=10)
+
+    found = _probe_exts(d, (".fast5", ".pod5"))
+    assert found == {".fast5": True, ".pod5": False}, f"Unexpected probe result: {found}"
+
+    make_file(d / "c" / "reads.pod5", size=10)
+    found = _probe_exts(d, (".fast5", ".pod5"))
+    assert found == {".fast5": True, ".pod5": True}, f"Unexpected probe result: {found}"
+
+    found = _probe_exts(d, (".fast5",), max_depth=2)
+    assert found == {".fast5": False}, "Should not look below max_depth"
+    print("  PASS: _probe_exts")
+
+
+class _FakeEntry:
+    """Just enough of os.DirEntry for diagnose_unknown's root scan: a plain file."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return False
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return True
+
+
 def test_diagnose_unknown_capped(tmp_path: Path) -> None:
     """Verify diagnose_unknown caps its scan and reports truncation."""
     run = tmp_path / "20240101_run_diagcap"
-    run.mkdir(parents=True)
-    # Create more files than the diagnostic cap
-    for i in range(5_100):
-        make_file(run / f"data_{i:06d}.bin", size=10)
-
-    diag = diagnose_unknown(run)
+    run.mkdir()
+    # Serve more entries than the diagnostic cap from a fake scandir rather
+    # than creating thousands of files; other paths still hit the real one
+    real_scandir = os.scandir
+    entries = [_FakeEntry(f"data_{i:06d}.bin") for i in range(5_100)]
+
+    def fake_scandir(path):
+        if os.fspath(path) != os.fspath(run):
+            return real_scandir(path)
+        fake = mock.MagicMock()
+        fake.__enter__.return_value = iter(entries)
+        return fake
+
+    with mock.patch.object(os, "scandir", fake_scandir):
+        diag = diagnose_unknown(run)
     assert any("Sampling stopped" in r for r in diag["reasons"]), \
         f"Should mention sampling cap: {diag['reasons']}"
     print("  PASS: diagnose_unknown capped")
 
 
+def test_unreadable_subdir_flagged_on_detected_format(tmp_path: Path) -> None:
+    """An unreadable non-format subdir next to root .fast5 files is reported, not hidden."""
+    run = tmp_path / "20240101_run_partial"
+    make_many(run, 3, "read_{}.fast5", size=30_000)
+    (run / "barcode01").mkdir()
+    locked = os.fspath(run / "barcode01")
+    # Tests may run as root, where chmod cannot deny access; fail the
+    # listing of that one directory instead
+    real_scandir = os.scandir
+
+    def fake_scandir(path):
+        if os.fspath(path) == locked:
+            raise PermissionError(13, "Permission denied", locked)
+        return real_scandir(path)
+
+    with mock.patch.object(os, "scandir", fake_scandir):
+        result = analyze_run(run)
+    assert result["formats"] == ["single_read_fast5"], f"Got {result['formats']}"
+    detail = result["details"]["single_read_fast5"]
+    assert detail["inaccessible_dirs"] == [locked]
+    assert "Permission denied on 1 dir(s)" in detail["note"]
+    print("  PASS: unreadable subdir flagged on detected format")
+
+
+def test_unreadable_pod5_dir_detected_by_open(tmp_path: Path) -> None:
+    """A matched pod5/ dir that cannot be opened is reported as permission denied."""
+    run = tmp_path / "20240101_run_locked_pod5"
+    (run / "pod5").mkdir(parents=True)
+    locked = os.fspath(run / "pod5")
+    real_scandir = os.scandir
+
+    def fake_scandir(path):
+        if os.fspath(path) == locked:
+            raise PermissionError(13, "Permission denied", locked)
+        return real_scandir(path)
+
+    # The readability probe opens the directory, so this also holds for
+    # root, where access() would always report the directory as readable
+    with mock.patch.object(os, "scandir", fake_scandir):
+        result = analyze_run(run)
+    detail = result["details"]["pod5"]
+    assert detail["inaccessible_dirs"] == [locked], f"Got {detail.get('inaccessible_dirs')}"
+    assert detail["note"].startswith("Permission denied on 1 pod5 dir(s)")
+    print("  PASS: unreadable pod5 dir detected by open")
+
+
 def test_data_size_summing(tmp_path: Path) -> None:
     """Verify that total_size_bytes is the sum of data_size_bytes from details."""
     run = tmp_path / "20240101_run_datasum"
-    (run / "pod5").mkdir(parents=True)
-    (run / "fastq_pass").mkdir(parents=True)
     make_file(run / "pod5" / "reads.pod5", size=1000)
     make_file(run / "fastq_pass" / "reads.fastq.gz", size=500)
 
@@ -478,13 +681,14 @@ def test_data_size_summing(tmp_path: Path) -> None:
         for detail in result["details"].values()
     )
     assert expected == 1500, f"Expected 1500, got {expected}"
+    assert result["total_size_bytes"] == expected, f"Expected total 1500, got {result['total_size_bytes']}"
+    assert "total_size_bytes" not in analyze_run(run, quick=True), "quick mode should not report a total"
     print("  PASS: data_size_bytes summing")
 
 
 def test_estimate_dir_size_exact(tmp_path: Path) -> None:
     """Few files -- count and size should be exact (no estimation)."""
     d = tmp_path / "20240101_run_est_exact" / "data"
-    d.mkdir(parents=True)
     make_file(d / "a.fast5", size=100)
     make_file(d / "b.fast5", size=200)
     make_file(d / "c.txt", size=999)  # should not match
@@ -499,11 +703,9 @@ def test_estimate_dir_size_exact(tmp_path: Path) -> None:
 def test_estimate_dir_size_estimated(tmp_path: Path) -> None:
     """More files than sample_size -- size should be estimated."""
     d = tmp_path / "20240101_run_est_sampled" / "data"
-    d.mkdir(parents=True)
     file_size = 500
     num_files = 20
-    for i in range(num_files):
-        make_file(d / f"read_{i:04d}.fast5", size=file_size)
+    make_many(d, num_files, "read_{:04d}.fast5", size=file_size)
 
     count, size, is_estimated = estimate_dir_size(d, ".fast5", sample_size=5)
     assert count == num_files, f"Expected count={num_files}, got {count}"
@@ -516,8 +718,6 @@ def test_estimate_dir_size_estimated(tmp_path: Path) -> None:
 def test_estimate_dir_size_recursive(tmp_path: Path) -> None:
     """Files in subdirectories -- recursive counting."""
     base = tmp_path / "20240101_run_est_rec" / "data"
-    (base / "sub1").mkdir(parents=True)
-    (base / "sub2").mkdir(parents=True)
     make_file(base / "a.fast5", size=100)
     make_file(base / "sub1" / "b.fast5", size=200)
     make_file(base / "sub2" / "c.fast5", size=300)
@@ -529,38 +729,6 @@ def test_estimate_dir_size_recursive(tmp_path: Path) -> None:
     print("  PASS: estimate_dir_size recursive")
 
 
-def test_single_read_fast5_has_size(tmp_path: Path) -> None:
-    """Single-read fast5 in fast5/ should report data_size_bytes."""
-    run = tmp_path / "20240101_run_sf5_size"
-    (run / "fast5").mkdir(parents=True)
-    for i in range(10):
-        make_file(run / "fast5" / f"read_{i:04d}.fast5", size=30_000)
-
-    result = analyze_run(run)
-    assert "single_read_fast5" in result["formats"]
-    detail = result["details"]["single_read_fast5"]
-    assert "data_size_bytes" in detail, f"Missing data_size_bytes: {detail}"
-    assert detail["file_count"] == 10, f"Expected 10, got {detail.get('file_count')}"
-    assert detail["data_size_bytes"] == 300_000, f"Expected 300000, got {detail['data_size_bytes']}"
-    print("  PASS: single_read_fast5 in fast5/ has size")
-
-
-def test_single_read_fast5_root_has_size(tmp_path: Path) -> None:
-    """Single-read fast5 in root should report data_size_bytes."""
-    run = tmp_path / "20240101_run_sf5_root_size"
-    run.mkdir(parents=True)
-    for i in range(10):
-        make_file(run / f"read_{i:04d}.fast5", size=30_000)
-
-    result = analyze_run(run)
-    assert "single_read_fast5" in result["formats"]
-    detail = result["details"]["single_read_fast5"]
-    assert "data_size_bytes" in detail, f"Missing data_size_bytes: {detail}"
-    assert detail["file_count"] == 10, f"Expected 10, got {detail.get('file_count')}"
-    assert detail["data_size_bytes"] == 300_000, f"Expected 300000, got {detail['data_size_bytes']}"
-    print("  PASS: single_read_fast5 in root has size")
-
-
 def test_write_stats_tsv_basic(tmp_path: Path) -> None:
     """Verify TSV output contains correct header and row values."""
     all_runs = {
@@ -579,15 +747,16 @@ def test_write_stats_tsv_basic(tmp_path: Path) -> None:
     tsv_path = str(tmp_path / "stats.tsv")
     write_stats_tsv(all_runs, tsv_path)
 
-    with open(tsv_path) as fh:
-        lines = fh.readlines()
+    with open(tsv_path, newline="") as fh:
+        lines = list(csv.reader(fh, delimiter="\t"))
     assert len(lines) == 2, f"Expected 2 lines (header + 1 row), got {len(lines)}"
-    header = lines[0].strip().split("\t")
+    header = lines[0]
     assert header == ["run_name", "format", "file_count", "data_size_bytes",
                       "size_estimated", "directories", "notes",
                       "flowcell_code", "sequencing_kit", "sample_rate",
                       "pore_type", "dorado_version"]
-    row = lines[1].strip().split("\t")
+    row = lines[1]
+    assert len(row) == len(header), f"Row has {len(row)} fields, header has {len(header)}"
     assert row[0] == "20240101_run_pod5"
     assert row[1] == "pod5"
     assert row[2] == "10"
@@ -616,14 +785,13 @@ def test_write_stats_tsv_multi_format_run(tmp_path: Path) -> None:
             },
         }
     }
-    tsv_path = str(tmp_path / "stats_multi.tsv")
-    write_stats_tsv(all_runs, tsv_path)
+    buf = io.StringIO(newline="")
+    write_stats_tsv(all_runs, buf)
 
-    with open(tsv_path) as fh:
-        lines = fh.readlines()
+    buf.seek(0)
+    lines = list(csv.reader(buf, delimiter="\t"))
     assert len(lines) == 3, f"Expected 3 lines (header + 2 rows), got {len(lines)}"
-    row1 = lines[1].strip().split("\t")
-    row2 = lines[2].strip().split("\t")
+    row1, row2 = lines[1], lines[2]
     assert row1[1] == "pod5"
     assert row2[1] == "fastq"
     print("  PASS: write_stats_tsv multi-format run")
@@ -677,6 +845,27 @@ def test_generate_conversion_multi_to_pod5(tmp_path: Path) -> None:
     print("  PASS: generate_conversion_script multi_read_fast5 -> pod5")
 
 
+def test_write_conversion_script(tmp_path: Path) -> None:
+    """Streamed script on disk should match the generated string and be executable."""
+    runs = {
+        "20240101_run_multi": {
+            "formats": ["multi_read_fast5"],
+            "details": {
+                "multi_read_fast5": {
+                    "directories": ["/data/run/fast5"],
+                }
+            },
+            "run_path": "/data/run",
+        }
+    }
+    out = tmp_path / "convert.sh"
+    write_conversion_script(runs, "pod5", out)
+    assert out.read_text() == generate_conversion_script(runs, "pod5") + "\n", \
+        "Streamed script should match generate_conversion_script output"
+    assert os.access(out, os.X_OK), "Script should be executable"
+    print("  PASS: write_conversion_script")
+
+
 def test_generate_conversion_with_output_dir(tmp_path: Path) -> None:
     """Conversion script with --output-dir writes to <output_dir>/<run_name>/<format>/."""
     runs = {
@@ -780,12 +969,8 @@ def test_generate_conversion_multi_with_metadata_patch(tmp_path: Path) -> None:
 def test_print_conversion_help_single_fast5(tmp_path: Path) -> None:
     """Conversion help for single_read_fast5 should mention two steps."""
     captured = io.StringIO()
-    old_stdout = sys.stdout
-    sys.stdout = captured
-    try:
+    with redirect_stdout(captured):
         print_conversion_help("single_read_fast5")
-    finally:
-        sys.stdout = old_stdout
     output = captured.getvalue()
     assert "two steps" in output.lower(), f"Should mention 'two steps', got: {output}"
     assert "single_to_multi_fast5" in output, f"Should mention single_to_multi_fast5, got: {output}"
@@ -796,13 +981,14 @@ def test_print_conversion_help_single_fast5(tmp_path: Path) -> None:
 def test_extract_chemistry_fast5_single_read(tmp_path: Path) -> None:
     """Extract chemistry from a single-read fast5 file."""
     f5 = tmp_path / "20240101_chem_sr" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("UniqueGlobalKey/context_tags")
-        ctx.attrs["flowcell_type"] = "flo-min106"
-        ctx.attrs["sequencing_kit"] = "sqk-lsk109"
-        ctx.attrs["sample_frequency"] = "4000"
+    make_fast5(
+        f5,
+        context_tags={
+            "flowcell_type": "flo-min106",
+            "sequencing_kit": "sqk-lsk109",
+            "sample_frequency": "4000",
+        },
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None
     assert result["flowcell"] == "FLO-MIN106"
@@ -814,13 +1000,15 @@ def test_extract_chemistry_fast5_single_read(tmp_path: Path) -> None:
 def test_extract_chemistry_fast5_multi_read(tmp_path: Path) -> None:
     """Extract chemistry from a multi-read fast5 file."""
     f5 = tmp_path / "20240101_chem_mr" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("read_001/context_tags")
-        ctx.attrs["flowcell_type"] = "flo-min114"
-        ctx.attrs["sequencing_kit"] = "sqk-lsk114"
-        ctx.attrs["sample_frequency"] = "5000"
+    make_fast5(
+        f5,
+        "read_001",
+        context_tags={
+            "flowcell_type": "flo-min114",
+            "sequencing_kit": "sqk-lsk114",
+            "sample_frequency": "5000",
+        },
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None
     assert result["flowcell"] == "FLO-MIN114"
@@ -832,86 +1020,69 @@ def test_extract_chemistry_fast5_multi_read(tmp_path: Path) -> None:
 def test_extract_chemistry_pod5_missing_lib(tmp_path: Path) -> None:
     """extract_chemistry_pod5 returns None when pod5 is not installed or file is invalid."""
     fake = tmp_path / "20240101_pod5_chem" / "fake.pod5"
-    fake.parent.mkdir(parents=True)
-    fake.write_bytes(b"\x00" * 100)
+    make_file(fake, size=100)
     result = extract_chemistry_pod5(fake)
     # Either None (pod5 not installed) or None (invalid file)
     assert result is None
     print("  PASS: extract_chemistry_pod5 missing lib or invalid file")
 
 
-def test_classify_chemistry_r10_5khz(tmp_path: Path) -> None:
-    """R10.4.1 at 5kHz should recommend dorado >=1.0."""
-    chem = {"flowcell": "FLO-MIN114", "kit": "SQK-LSK114", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4.1"
-    assert result["dorado_version"] == ">=1.0"
-    assert result["analyte"] == "dna"
-    print("  PASS: classify_chemistry R10.4.1 5kHz")
-
-
-def test_classify_chemistry_r9(tmp_path: Path) -> None:
-    """R9.4.1 should recommend dorado 0.9.6."""
-    chem = {"flowcell": "FLO-MIN106", "kit": "SQK-LSK109", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R9.4.1"
-    assert result["dorado_version"] == "0.9.6"
-    assert result["note"] is not None and "0.9.6" in result["note"]
-    print("  PASS: classify_chemistry R9.4.1")
-
-
-def test_classify_chemistry_r10_4khz(tmp_path: Path) -> None:
-    """R10.4.1 at 4kHz (legacy) should recommend dorado 0.9.6."""
-    chem = {"flowcell": "FLO-MIN114", "kit": "SQK-LSK114", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4.1"
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry R10.4.1 4kHz")
-
-
-def test_classify_chemistry_rna004(tmp_path: Path) -> None:
-    """RNA004 kit should recommend dorado >=1.0."""
-    chem = {"flowcell": "FLO-MIN114", "kit": "SQK-RNA004", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["analyte"] == "rna"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry RNA004")
-
-
-def test_classify_chemistry_rna002(tmp_path: Path) -> None:
-    """RNA002 kit should recommend dorado 0.9.6."""
-    chem = {"flowcell": "FLO-MIN106", "kit": "SQK-RNA002", "sample_rate": 3000}
-    result = classify_chemistry(chem)
-    assert result["analyte"] == "rna"
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry RNA002")
-
-
-def test_classify_chemistry_unknown(tmp_path: Path) -> None:
-    """Unknown flowcell code should report unknown pore with no version recommendation."""
-    chem = {"flowcell": "FLO-PROTOTYPE", "kit": "SQK-BETA", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "unknown"
-    assert result["dorado_version"] is None
-    print("  PASS: classify_chemistry unknown flowcell")
+# (chemistry, pore, dorado_version, analyte); analyte None means "not checked"
+CLASSIFY_CHEMISTRY_CASES = [
+    ({"flowcell": "FLO-MIN114", "kit": "SQK-LSK114", "sample_rate": 5000}, "R10.4.1", ">=1.0", "dna"),
+    ({"flowcell": "FLO-MIN106", "kit": "SQK-LSK109", "sample_rate": 4000}, "R9.4.1", "0.9.6", None),
+    ({"flowcell": "FLO-MIN114", "kit": "SQK-LSK114", "sample_rate": 4000}, "R10.4.1", "0.9.6", None),
+    ({"flowcell": "FLO-MIN114", "kit": "SQK-RNA004", "sample_rate": 4000}, None, ">=1.0", "rna"),
+    ({"flowcell": "FLO-MIN106", "kit": "SQK-RNA002", "sample_rate": 3000}, None, "0.9.6", "rna"),
+    ({"flowcell": "FLO-PROTOTYPE", "kit": "SQK-BETA", "sample_rate": 5000}, "unknown", None, None),
+    # 6kHz PromethION from 2018 and 3kHz very old runs are R9.4.1, not R10.4.1
+    ({"flowcell": "", "kit": "", "sample_rate": 6000}, "R9.4.1", "0.9.6", None),
+    ({"flowcell": "", "kit": "", "sample_rate": 3012}, "R9.4.1", "0.9.6", None),
+    ({"flowcell": "FLO-MIN111", "kit": "", "sample_rate": 4000}, "R10.3", "0.9.6", None),
+    ({"flowcell": "FLO-MIN112", "kit": "SQK-LSK114", "sample_rate": 5000}, "R10.4", ">=1.0", None),
+    ({"flowcell": "FLO-MIN004RA", "kit": "SQK-RNA004", "sample_rate": 4000}, "RNA004", ">=1.0", "rna"),
+    ({"flowcell": "FLO-MIN114HD", "kit": "SQK-LSK114", "sample_rate": 5000}, "R10.4.1", ">=1.0", None),
+    # Empty flowcell: pore inferred from the kit code
+    ({"flowcell": "", "kit": "SQK-LSK109", "sample_rate": 4000}, "R9.4.1", "0.9.6", None),
+    ({"flowcell": "", "kit": "SQK-RBK114-24", "sample_rate": 5000}, "R10.4.1", ">=1.0", None),
+    # Empty flowcell and kit: pore inferred from the sample rate
+    ({"flowcell": "", "kit": "", "sample_rate": 4000}, "R9.4.1", "0.9.6", None),
+    ({"flowcell": "", "kit": "", "sample_rate": 5000}, "R10.4.1", ">=1.0", None),
+]
+
+
+def test_classify_chemistry(tmp_path: Path) -> None:
+    """classify_chemistry maps flowcell/kit/sample rate to pore and dorado version."""
+    for chem, pore, version, analyte in CLASSIFY_CHEMISTRY_CASES:
+        result = classify_chemistry(chem)
+        if pore is not None:
+            assert result["pore"] == pore, f"{chem}: expected {pore}, got {result['pore']}"
+        assert result["dorado_version"] == version, (
+            f"{chem}: expected dorado {version}, got {result['dorado_version']}"
+        )
+        if analyte is not None:
+            assert result["analyte"] == analyte, f"{chem}: expected {analyte}"
+        # Every 0.9.6 recommendation explains why in the note
+        if version == "0.9.6":
+            assert result["note"] is not None and "0.9.6" in result["note"]
+        else:
+            assert result["note"] is None
+    print(f"  PASS: classify_chemistry ({len(CLASSIFY_CHEMISTRY_CASES)} cases)")
 
 
 def test_analyze_run_includes_chemistry(tmp_path: Path) -> None:
     """analyze_run() should include chemistry from fast5 metadata."""
-    import h5py
     run = tmp_path / "20240101_run_chem"
-    fast5_dir = run / "fast5"
-    fast5_dir.mkdir(parents=True)
-    f5 = fast5_dir / "batch_001.fast5"
+    f5 = run / "fast5" / "batch_001.fast5"
     # Create a multi-read fast5 (>1MB) with chemistry metadata
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("read_001/context_tags")
-        ctx.attrs["flowcell_type"] = "flo-min106"
-        ctx.attrs["sequencing_kit"] = "sqk-lsk109"
-        ctx.attrs["sample_frequency"] = "4000"
-        # Pad to >1MB for multi-read classification
-        import numpy as np
-        f.create_dataset("read_001/Raw/Signal", data=np.zeros(375_000, dtype=np.int32))
+    make_fast5(
+        f5,
+        "read_001",
+        context_tags={"flowcell_type": "flo-min106", "sequencing_kit": "sqk-lsk109", "sample_frequency": "4000"},
+    )
+    # Pad to >1MB for multi-read classification. A sparse tail past HDF5's
+    # end-of-file address is ignored by the library, so no signal is written.
+    os.truncate(f5, 1_500_000)
 
     result = analyze_run(run)
     assert "chemistry" in result, f"Missing chemistry key: {result.keys()}"
@@ -928,12 +1099,10 @@ def test_pod5_barcoded_chemistry(tmp_path: Path) -> None:
     """Pod5 files inside barcode subdirs should still yield chemistry."""
     run = tmp_path / "20240101_run_barcoded_pod5"
     bc_dir = run / "pod5_pass" / "barcode01"
-    bc_dir.mkdir(parents=True)
-    make_file(bc_dir / "reads_001.pod5", size=5_000_000)
+    make_file(bc_dir / "reads_001.pod5", size=5000)
     # Also add a barcode02 dir so first scandir entry is a directory
     bc2_dir = run / "pod5_pass" / "barcode02"
-    bc2_dir.mkdir()
-    make_file(bc2_dir / "reads_001.pod5", size=5_000_000)
+    make_file(bc2_dir / "reads_001.pod5", size=5000)
 
     result = analyze_run(run)
     assert "pod5" in result["formats"], f"Expected pod5, got {result['formats']}"
@@ -941,24 +1110,54 @@ def test_pod5_barcoded_chemistry(tmp_path: Path) -> None:
     # but the key test is that _find_first_pod5 successfully locates a .pod5 file
     # inside the barcode subdirectory. We verify this indirectly: no crash, and the
     # format is detected. For a direct unit test of _find_first_pod5:
-    from nanopore_format_checker import _find_first_pod5
+    from nanopore_format_checker import _find_first_pod5, _iter_pod5_samples
     found = _find_first_pod5(run / "pod5_pass")
     assert found is not None, "Should find pod5 inside barcode subdir"
     assert found.suffix == ".pod5"
+
+    # Candidates come from one pass over the barcode dirs, capped at max_files
+    samples = list(_iter_pod5_samples(run / "pod5_pass", max_files=3))
+    assert len(samples) == 2, f"Expected one candidate per barcode dir, got {samples}"
+    assert len(list(_iter_pod5_samples(run / "pod5_pass", max_files=1))) == 1
     print("  PASS: pod5 barcoded chemistry lookup")
 
 
+def test_pod5_chemistry_retries_only_on_read_errors(tmp_path: Path) -> None:
+    """A pod5 that opens but has no metadata is not followed by more opens in that dir."""
+    run = tmp_path / "20240101_run_pod5_retry"
+    make_many(run / "pod5", 3, "reads_{}.pod5")
+
+    calls = []
+
+    def no_metadata(path):
+        calls.append(path)
+        return None
+
+    with mock.patch("nanopore_format_checker._read_pod5_chemistry", no_metadata):
+        result = analyze_run(run, quick=True)
+    assert result["chemistry"] is None
+    assert len(calls) == 1, f"Expected one open for empty metadata, got {len(calls)}"
+
+    calls.clear()
+
+    def unreadable(path):
+        calls.append(path)
+        raise OSError("truncated")
+
+    with mock.patch("nanopore_format_checker._read_pod5_chemistry", unreadable):
+        analyze_run(run, quick=True)
+    assert len(calls) == 3, f"Expected every candidate tried after errors, got {len(calls)}"
+    print("  PASS: pod5 chemistry retries only on read errors")
+
+
 def test_fast5_barcoded_sampling(tmp_path: Path) -> None:
     """Fast5 files inside barcode subdirs should be sampled and classified correctly."""
     run = tmp_path / "20210415_FAP92655_barcoded_fast5"
     bc_dir = run / "fast5_pass" / "barcode13"
-    bc_dir.mkdir(parents=True)
     # Create small files -> single_read_fast5
-    for i in range(3):
-        make_file(bc_dir / f"read_{i}.fast5", size=10_000)
+    make_many(bc_dir, 3, "read_{}.fast5", size=10_000)
     # Add a second barcode dir
     bc2_dir = run / "fast5_pass" / "barcode14"
-    bc2_dir.mkdir()
     make_file(bc2_dir / "read_0.fast5", size=10_000)
 
     result = analyze_run(run)
@@ -976,7 +1175,6 @@ def test_fast5_barcoded_multi_read(tmp_path: Path) -> None:
     """Multi-read fast5 inside barcode subdirs should be classified as multi_read_fast5."""
     run = tmp_path / "20210415_FAP92655_barcoded_multi"
     bc_dir = run / "fast5_pass" / "barcode01"
-    bc_dir.mkdir(parents=True)
     # Create large files -> multi_read_fast5
     make_file(bc_dir / "batch_0.fast5", size=5_000_000)
 
@@ -990,16 +1188,11 @@ def test_fast5_barcoded_multi_read(tmp_path: Path) -> None:
 def test_extract_chemistry_fast5_tracking_id_fallback(tmp_path: Path) -> None:
     """Extract chemistry when context_tags/flowcell_type is empty but tracking_id has it."""
     f5 = tmp_path / "20240101_chem_trk" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("UniqueGlobalKey/context_tags")
-        ctx.attrs["flowcell_type"] = ""  # empty
-        ctx.attrs["sequencing_kit"] = "sqk-lsk114"
-        ctx.attrs["sample_frequency"] = "5000"
-        trk = f.create_group("UniqueGlobalKey/tracking_id")
-        trk.attrs["flow_cell_product_code"] = "flo-min114"
-        trk.attrs["sample_frequency"] = "5000"
+    make_fast5(
+        f5,
+        context_tags={"flowcell_type": "", "sequencing_kit": "sqk-lsk114", "sample_frequency": "5000"},
+        tracking_id={"flow_cell_product_code": "flo-min114", "sample_frequency": "5000"},
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None, "Should fall back to tracking_id"
     assert result["flowcell"] == "FLO-MIN114"
@@ -1011,16 +1204,12 @@ def test_extract_chemistry_fast5_tracking_id_fallback(tmp_path: Path) -> None:
 def test_extract_chemistry_fast5_multi_read_tracking_id(tmp_path: Path) -> None:
     """Extract chemistry from multi-read layout using tracking_id fallback."""
     f5 = tmp_path / "20240101_chem_mr_trk" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("read_abc123/context_tags")
-        ctx.attrs["flowcell_type"] = ""  # empty
-        ctx.attrs["sequencing_kit"] = "sqk-lsk109"
-        ctx.attrs["sample_frequency"] = "0"
-        trk = f.create_group("read_abc123/tracking_id")
-        trk.attrs["flow_cell_product_code"] = "flo-min106"
-        trk.attrs["sample_frequency"] = "4000"
+    make_fast5(
+        f5,
+        "read_abc123",
+        context_tags={"flowcell_type": "", "sequencing_kit": "sqk-lsk109", "sample_frequency": "0"},
+        tracking_id={"flow_cell_product_code": "flo-min106", "sample_frequency": "4000"},
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None, "Should fall back to tracking_id in multi-read layout"
     assert result["flowcell"] == "FLO-MIN106"
@@ -1045,27 +1234,6 @@ def test_extract_chemistry_pod5_sample_rate_only(tmp_path: Path) -> None:
     print("  PASS: extract_chemistry_pod5 sample-rate-only (converted from old fast5)")
 
 
-def test_classify_chemistry_sample_rate_6khz_promethion(tmp_path: Path) -> None:
-    """6kHz PromethION from 2018 should be R9.4.1, not R10.4.1."""
-    chem = {"flowcell": "", "kit": "", "sample_rate": 6000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R9.4.1", (
-        f"6kHz PromethION should be R9.4.1, got {result['pore']}"
-    )
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry 6kHz PromethION -> R9.4.1")
-
-
-def test_classify_chemistry_sample_rate_3khz(tmp_path: Path) -> None:
-    """3kHz from very old runs should map to R9.4.1."""
-    chem = {"flowcell": "", "kit": "", "sample_rate": 3012}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R9.4.1", (
-        f"3kHz should be R9.4.1, got {result['pore']}"
-    )
-    print("  PASS: classify_chemistry 3kHz -> R9.4.1")
-
-
 def test_extract_chemistry_pod5_context_tags_fallback(tmp_path: Path) -> None:
     """Pod5 with flowcell in context_tags dict (from fast5 conversion) should be detected."""
     # The pod5 RunInfo stores context_tags as Dict[str, str]; the converter
@@ -1078,73 +1246,14 @@ def test_extract_chemistry_pod5_context_tags_fallback(tmp_path: Path) -> None:
     print("  PASS: extract_chemistry_pod5 context_tags fallback")
 
 
-def test_classify_chemistry_r10_3(tmp_path: Path) -> None:
-    """R10.3 (FLO-MIN111) should recommend dorado 0.9.6."""
-    chem = {"flowcell": "FLO-MIN111", "kit": "", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.3", f"Expected R10.3, got {result['pore']}"
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry R10.3")
-
-
-def test_classify_chemistry_r10_4(tmp_path: Path) -> None:
-    """R10.4 at 5kHz should recommend dorado >=1.0."""
-    chem = {"flowcell": "FLO-MIN112", "kit": "SQK-LSK114", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry R10.4 5kHz")
-
-
-def test_classify_chemistry_rna_flowcell(tmp_path: Path) -> None:
-    """RNA004 flowcell (FLO-MIN004RA) should map to RNA004 pore."""
-    chem = {"flowcell": "FLO-MIN004RA", "kit": "SQK-RNA004", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "RNA004"
-    assert result["analyte"] == "rna"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry RNA004 flowcell")
-
-
-def test_classify_chemistry_hd_flowcell(tmp_path: Path) -> None:
-    """FLO-MIN114HD should map to R10.4.1."""
-    chem = {"flowcell": "FLO-MIN114HD", "kit": "SQK-LSK114", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4.1"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry HD flowcell")
-
-
-def test_classify_chemistry_kit_fallback(tmp_path: Path) -> None:
-    """When flowcell is empty, pore should be inferred from kit code."""
-    chem = {"flowcell": "", "kit": "SQK-LSK109", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R9.4.1", f"Expected R9.4.1 from kit fallback, got {result['pore']}"
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry kit fallback (R9.4.1)")
-
-
-def test_classify_chemistry_kit_fallback_r10(tmp_path: Path) -> None:
-    """Kit-based fallback for R10.4.1 kits."""
-    chem = {"flowcell": "", "kit": "SQK-RBK114-24", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4.1", f"Expected R10.4.1 from kit fallback, got {result['pore']}"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry kit fallback (R10.4.1)")
-
-
 def test_extract_chemistry_fast5_kit_only(tmp_path: Path) -> None:
     """extract_chemistry_fast5 should return results even without flowcell if kit is present."""
     f5 = tmp_path / "20200210_kit_only" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("UniqueGlobalKey/context_tags")
-        ctx.attrs["flowcell_type"] = ""
-        ctx.attrs["sequencing_kit"] = "sqk-lsk109"
-        ctx.attrs["sample_frequency"] = "4000"
-        trk = f.create_group("UniqueGlobalKey/tracking_id")
-        trk.attrs["flow_cell_product_code"] = ""
+    make_fast5(
+        f5,
+        context_tags={"flowcell_type": "", "sequencing_kit": "sqk-lsk109", "sample_frequency": "4000"},
+        tracking_id={"flow_cell_product_code": ""},
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None, "Should return partial results with kit only"
     assert result["flowcell"] == ""
@@ -1153,37 +1262,19 @@ def test_extract_chemistry_fast5_kit_only(tmp_path: Path) -> None:
     print("  PASS: extract_chemistry_fast5 kit-only fallback")
 
 
-def test_classify_chemistry_sample_rate_fallback(tmp_path: Path) -> None:
-    """When flowcell and kit are both empty, infer pore from sample rate."""
-    chem = {"flowcell": "", "kit": "", "sample_rate": 4000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R9.4.1", f"Expected R9.4.1 from 4kHz fallback, got {result['pore']}"
-    assert result["dorado_version"] == "0.9.6"
-    print("  PASS: classify_chemistry sample rate fallback (4kHz -> R9.4.1)")
-
-
-def test_classify_chemistry_sample_rate_fallback_5khz(tmp_path: Path) -> None:
-    """5kHz with no flowcell/kit should infer R10.4.1."""
-    chem = {"flowcell": "", "kit": "", "sample_rate": 5000}
-    result = classify_chemistry(chem)
-    assert result["pore"] == "R10.4.1", f"Expected R10.4.1 from 5kHz fallback, got {result['pore']}"
-    assert result["dorado_version"] == ">=1.0"
-    print("  PASS: classify_chemistry sample rate fallback (5kHz -> R10.4.1)")
-
-
 def test_extract_chemistry_fast5_experiment_kit(tmp_path: Path) -> None:
     """Older MinKNOW used experiment_kit instead of sequencing_kit."""
     f5 = tmp_path / "20200303_exp_kit" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
-        ctx = f.create_group("UniqueGlobalKey/context_tags")
-        ctx.attrs["flowcell_type"] = ""
-        ctx.attrs["sequencing_kit"] = ""
-        ctx.attrs["experiment_kit"] = "sqk-lsk109"
-        ctx.attrs["sample_frequency"] = "4000"
-        trk = f.create_group("UniqueGlobalKey/tracking_id")
-        trk.attrs["flow_cell_product_code"] = ""
+    make_fast5(
+        f5,
+        context_tags={
+            "flowcell_type": "",
+            "sequencing_kit": "",
+            "experiment_kit": "sqk-lsk109",
+            "sample_frequency": "4000",
+        },
+        tracking_id={"flow_cell_product_code": ""},
+    )
     result = extract_chemistry_fast5(f5)
     assert result is not None, "Should find kit via experiment_kit attribute"
     assert result["kit"] == "SQK-LSK109"
@@ -1194,19 +1285,22 @@ def test_extract_chemistry_fast5_experiment_kit(tmp_path: Path) -> None:
 def test_extract_chemistry_fast5_channel_id_only(tmp_path: Path) -> None:
     """Fast5 with no context_tags/tracking_id but channel_id/sampling_rate should still work."""
     f5 = tmp_path / "20200303_chan_only" / "read.fast5"
-    f5.parent.mkdir(parents=True)
-    import h5py
-    with h5py.File(f5, "w") as f:
+    os.makedirs(f5.parent, exist_ok=True)
+    with h5py.File(f5, "w", driver="core", backing_store=True) as f:
         # Mimic old multi-read layout: read_<uuid>/ with channel_id but no context_tags
         read_grp = f.create_group("read_00c9fb35-4d96-4dbb-8d5e-3ecec34c156a")
-        read_grp.attrs["pore_type"] = b"not_set"
-        read_grp.attrs["run_id"] = b"ed117474705eeeb612734f6acc0e1f8aa99e3bd7"
-        chan = read_grp.create_group("channel_id")
-        chan.attrs["channel_number"] = b"372"
-        chan.attrs["sampling_rate"] = 4000.0  # float, as in real files
-        raw = read_grp.create_group("Raw")
-        raw.attrs["duration"] = 5000
-        raw.attrs["read_id"] = b"00c9fb35-4d96-4dbb-8d5e-3ecec34c156a"
+        read_grp.attrs.update({
+            "pore_type": b"not_set",
+            "run_id": b"ed117474705eeeb612734f6acc0e1f8aa99e3bd7",
+        })
+        read_grp.create_group("channel_id").attrs.update({
+            "channel_number": b"372",
+            "sampling_rate": 4000.0,  # float, as in real files
+        })
+        read_grp.create_group("Raw").attrs.update({
+            "duration": 5000,
+            "read_id": b"00c9fb35-4d96-4dbb-8d5e-3ecec34c156a",
+        })
     result = extract_chemistry_fast5(f5)
     assert result is not None, "Should extract sample_rate from channel_id"
     assert result["sample_rate"] == 4000
@@ -1215,6 +1309,21 @@ def test_extract_chemistry_fast5_channel_id_only(tmp_path: Path) -> None:
     print("  PASS: extract_chemistry_fast5 channel_id only")
 
 
+def test_extract_chemistry_fast5_channel_id_skips_zero_rate(tmp_path: Path) -> None:
+    """A multi-read file whose first reads have no usable rate falls through to a later read."""
+    f5 = tmp_path / "20200303_chan_zero" / "batch.fast5"
+    os.makedirs(f5.parent, exist_ok=True)
+    with h5py.File(f5, "w", driver="core", backing_store=True) as f:
+        # Groups iterate in name order: rate 0, then no rate, then 4000
+        f.create_group("read_0/channel_id").attrs["sampling_rate"] = 0.0
+        f.create_group("read_1/channel_id")
+        f.create_group("read_2/channel_id").attrs["sampling_rate"] = 4000.0
+    result = extract_chemistry_fast5(f5)
+    assert result is not None, "Should find the rate on a later read"
+    assert result["sample_rate"] == 4000, f"Expected 4000, got {result['sample_rate']}"
+    print("  PASS: extract_chemistry_fast5 channel_id skips zero rate")
+
+
 def test_tsv_includes_chemistry_columns(tmp_path: Path) -> None:
     """TSV output should include chemistry columns."""
     all_runs = {
@@ -1234,18 +1343,18 @@ def test_tsv_includes_chemistry_columns(tmp_path: Path) -> None:
             },
         }
     }
-    tsv_path = str(tmp_path / "stats_chem.tsv")
-    write_stats_tsv(all_runs, tsv_path)
+    buf = io.StringIO(newline="")
+    write_stats_tsv(all_runs, buf)
 
-    with open(tsv_path) as fh:
-        lines = fh.readlines()
-    header = lines[0].strip().split("\t")
+    buf.seek(0)
+    reader = csv.reader(buf, delimiter="\t")
+    header = next(reader)
+    row = next(reader)
     assert "flowcell_code" in header
     assert "sequencing_kit" in header
     assert "sample_rate" in header
     assert "pore_type" in header
     assert "dorado_version" in header
-    row = lines[1].strip().split("\t")
     fc_idx = header.index("flowcell_code")
     assert row[fc_idx] == "FLO-MIN114"
     pore_idx = header.index("pore_type")
@@ -1253,98 +1362,58 @@ def test_tsv_includes_chemistry_columns(tmp_path: Path) -> None:
     print("  PASS: TSV includes chemistry columns")
 
 
+def _run_test(name: str, tmp: str) -> str | None:
+    """Run one test by name in its own directory under tmp; return the error, if any.
+
+    Tests are looked up by name so this also works in pool worker processes.
+    """
+    # Each test gets its own directory, like pytest's tmp_path, and it is
+    # removed as soon as the test finishes to keep tmpfs usage low
+    tmp_path = Path(tmp) / name
+    tmp_path.mkdir()
+    try:
+        globals()[name](tmp_path)
+        return None
+    except Exception as e:
+        return str(e)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Run the format detection tests.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (default: 1, runs in-process)")
+    args = parser.parse_args()
+
     print("Running format detection tests...\n")
     passed = 0
     failed = 0
 
-    tests = [
-        test_pod5_subdirectory,
-        test_pod5_variant_dirs,
-        test_multi_read_fast5,
-        test_single_read_fast5_in_fast5_dir,
-        test_single_read_fast5_in_root,
-        test_single_read_fast5_numeric_subdirs,
-        test_fast5_variant_dirs,
-        test_compressed_archives,
-        test_empty_directory,
-        test_fastq_directory,
-        test_mixed_formats,
-        test_nested_pod5,
-        test_find_named_subdirs_skips_files,
-        test_empty_fast5_dir,
-        test_fast5_with_numeric_subdirs,
-        test_many_files_in_root_performance,
-        test_diagnose_unknown_with_deep_fast5,
-        test_discover_run_structure,
-        test_fast_count_files_returns_size,
-        test_fast_count_files_recursive_size,
-        test_format_size,
-        test_compute_dir_size,
-        test_quick_mode,
-        test_size_in_pod5_result,
-        test_size_in_fastq_result,
-        test_discover_skips_data_dirs,
-        test_find_named_subdirs_skips_matched,
-        test_has_file_with_ext_budget,
-        test_diagnose_unknown_capped,
-        test_data_size_summing,
-        test_estimate_dir_size_exact,
-        test_estimate_dir_size_estimated,
-        test_estimate_dir_size_recursive,
-        test_single_read_fast5_has_size,
-        test_single_read_fast5_root_has_size,
-        test_write_stats_tsv_basic,
-        test_write_stats_tsv_multi_format_run,
-        test_generate_conversion_single_to_pod5,
-        test_generate_conversion_multi_to_pod5,
-        test_generate_conversion_with_output_dir,
-        test_generate_conversion_without_output_dir,
-        test_generate_conversion_with_metadata_patch,
-        test_generate_conversion_multi_with_metadata_patch,
-        test_print_conversion_help_single_fast5,
-        test_extract_chemistry_fast5_single_read,
-        test_extract_chemistry_fast5_multi_read,
-        test_extract_chemistry_fast5_tracking_id_fallback,
-        test_extract_chemistry_fast5_multi_read_tracking_id,
-        test_extract_chemistry_pod5_missing_lib,
-        test_extract_chemistry_pod5_sample_rate_only,
-        test_classify_chemistry_sample_rate_6khz_promethion,
-        test_classify_chemistry_sample_rate_3khz,
-        test_extract_chemistry_pod5_context_tags_fallback,
-        test_classify_chemistry_r10_5khz,
-        test_classify_chemistry_r9,
-        test_classify_chemistry_r10_4khz,
-        test_classify_chemistry_rna004,
-        test_classify_chemistry_rna002,
-        test_classify_chemistry_unknown,
-        test_classify_chemistry_r10_3,
-        test_classify_chemistry_r10_4,
-        test_classify_chemistry_rna_flowcell,
-        test_classify_chemistry_hd_flowcell,
-        test_classify_chemistry_kit_fallback,
-        test_classify_chemistry_kit_fallback_r10,
-        test_extract_chemistry_fast5_kit_only,
-        test_classify_chemistry_sample_rate_fallback,
-        test_classify_chemistry_sample_rate_fallback_5khz,
-        test_extract_chemistry_fast5_experiment_kit,
-        test_extract_chemistry_fast5_channel_id_only,
-        test_analyze_run_includes_chemistry,
-        test_pod5_barcoded_chemistry,
-        test_fast5_barcoded_sampling,
-        test_fast5_barcoded_multi_read,
-        test_tsv_includes_chemistry_columns,
-    ]
-
-    with tempfile.TemporaryDirectory() as tmp:
-        tmp_path = Path(tmp)
-        for test_fn in tests:
-            try:
-                test_fn(tmp_path)
-                passed += 1
-            except Exception as e:
-                print(f"  FAIL: {test_fn.__name__}: {e}")
-                failed += 1
+    # Every test_* function, in definition order, so new tests cannot be
+    # left out of the runner by accident
+    names = [name for name, fn in globals().items() if name.startswith("test_") and callable(fn)]
+
+    # Fixtures are only ever stat()ed and listed, so keep them on tmpfs
+    # (Linux /dev/shm) when available instead of the disk-backed tmp dir
+    shm = "/dev/shm"
+    tmp_root = shm if os.path.isdir(shm) and os.access(shm, os.W_OK | os.X_OK) else None
+    with tempfile.TemporaryDirectory(dir=tmp_root) as tmp:
+        # The suite runs in well under a second in-process, which is less
+        # than pool startup costs, so worker processes are opt-in. Tests only
+        # share read-only module state; results come back in definition order
+        if args.jobs > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                errors = list(pool.map(_run_test, names, [tmp] * len(names)))
+        else:
+            errors = [_run_test(name, tmp) for name in names]
+
+    for name, error in zip(names, errors):
+        if error is None:
+            passed += 1
+        else:
+            print(f"  FAIL: {name}: {error}")
+            failed += 1
 
     print(f"\n{passed} passed, {failed} failed out of {passed + failed} tests")
     return 0 if failed == 0 else 1